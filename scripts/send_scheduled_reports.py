@@ -9,26 +9,40 @@ import sys
 import os
 import asyncio
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default event loop
+    uvloop = None
+
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.main.python.core.settings import Settings
-from src.main.python.services.redmine_service import RedmineService
-from src.main.python.services.email_service import EmailService
-from src.main.python.services.report_generator import ReportGenerator
-from src.main.python.services.scheduler_service import SchedulerService
+from src.main.python.utils.config import get_settings
+
+# Load settings at import time so a failing .env is reported before any work starts
+settings = get_settings()
+
+# Configure logging; records are queued and written by a background thread
+# so file and console I/O never blocks the event loop
+log_queue = queue.SimpleQueue()
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.StreamHandler(),
+    RotatingFileHandler('/tmp/redmine_scheduled_reports.log', maxBytes=10_000_000, backupCount=3)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
 
-# Configure logging
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('/tmp/redmine_scheduled_reports.log')
-    ]
+    level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
+    handlers=[QueueHandler(log_queue)]
 )
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
 
 logger = logging.getLogger(__name__)
 
@@ -37,20 +51,27 @@ async def main():
     try:
         logger.info("=== Starting scheduled report generation ===")
         
-        # Initialize settings
-        settings = Settings()
-        logger.info("Settings initialized")
+        # Import services only once settings have loaded; the cron path
+        # never needs the web stack (FastAPI/uvicorn)
+        from src.main.python.services.redmine_service import RedmineService
+        from src.main.python.services.email_service import EmailService
+        from src.main.python.services.report_generator import ReportGenerator
+        from src.main.python.services.scheduler_service import SchedulerService
         
-        # Initialize services
-        redmine_service = RedmineService(settings)
+        # Initialize services; one Redmine HTTP session and one SMTP session
+        # are shared by every report in this run
         email_service = EmailService(settings)
-        report_generator = ReportGenerator(settings, redmine_service, email_service)
-        scheduler_service = SchedulerService(report_generator, settings)
-        
-        logger.info("Services initialized")
-        
-        # Send scheduled reports
-        await scheduler_service.send_scheduled_reports()
+        async with RedmineService(settings) as redmine_service:
+            report_generator = ReportGenerator(settings, redmine_service, email_service)
+            scheduler_service = SchedulerService(report_generator, settings)
+            
+            logger.info("Services initialized")
+            
+            try:
+                # Send scheduled reports
+                await scheduler_service.send_scheduled_reports()
+            finally:
+                await email_service.close()
         
         logger.info("=== Scheduled report generation completed ===")
         
@@ -59,4 +80,12 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    log_listener.start()
+    try:
+        if uvloop:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    finally:
+        # Flush queued records (also on sys.exit from main)
+        log_listener.stop()
\ No newline at end of file
@@ -5,120 +5,242 @@ Email Service
 Service for sending report emails via SMTP.
 """
 
+import asyncio
 import logging
-import smtplib
 import ssl
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email import utils as email_utils
-from typing import List
+from email.policy import SMTP as SMTP_POLICY
+from typing import List, Optional, Tuple
+
+import aiosmtplib
 
 logger = logging.getLogger(__name__)
 
+# Candidate transports in preference order: Redmine-compatible STARTTLS first,
+# then implicit SSL on 465, then plain SMTP on 25
+_TRANSPORTS = ("starttls", "ssl", "plain")
+
+# SSL contexts are built once per process; loading the CA bundle per connect
+# is wasted work and contexts are safe to share across connections.
+# Relaxed context matches Redmine (openssl_verify_mode: none)
+_RELAXED_SSL_CTX = ssl.create_default_context()
+_RELAXED_SSL_CTX.check_hostname = False
+_RELAXED_SSL_CTX.verify_mode = ssl.CERT_NONE
+# Strict context for the connection test
+_STRICT_SSL_CTX = ssl.create_default_context()
+
+@lru_cache(maxsize=4)
+def _html_part(body: str) -> MIMEText:
+    """Encode an HTML body once; the same report sent again reuses the encoded part"""
+    return MIMEText(body, "html", "utf-8", policy=SMTP_POLICY)
+
 class EmailService:
     """Service for email operations"""
     
     def __init__(self, settings):
         self.settings = settings
-        logger.info(f"Initialized Email service with SMTP: {settings.SMTP_HOST}:{settings.SMTP_PORT}")
+        
+        # Pooled SMTP session reused across sends (STARTTLS + LOGIN done once)
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._lock = asyncio.Lock()
+        
+        # Transport is decided once (SMTP_TRANSPORT or the first successful probe)
+        transport = getattr(settings, 'SMTP_TRANSPORT', '').lower()
+        self._transport: Optional[str] = transport if transport in _TRANSPORTS else None
+        
+        logger.info("Initialized Email service with SMTP: %s:%s", settings.SMTP_HOST, settings.SMTP_PORT)
     
-    async def send_report_email(self, subject: str, body: str, recipients: List[str]) -> bool:
-        """Send report email to recipients"""
-        logger.info(f"Starting email send to {len(recipients)} recipients: {recipients}")
+    def _credentials(self) -> dict:
+        """Get SMTP login arguments (same as authentication: :login)"""
+        if hasattr(self.settings, 'SMTP_USERNAME') and self.settings.SMTP_USERNAME:
+            return {'username': self.settings.SMTP_USERNAME, 'password': self.settings.SMTP_PASSWORD}
+        return {}
+    
+    def _smtp_client(self, transport: str, timeout: int = 30) -> aiosmtplib.SMTP:
+        """Build an SMTP client for the given transport"""
+        if transport == "ssl":
+            port, options = 465, {'use_tls': True, 'start_tls': False}
+        elif transport == "plain":
+            # Login is attempted separately in _connect: a local relay may not need it
+            return aiosmtplib.SMTP(
+                hostname=self.settings.SMTP_HOST,
+                port=25,
+                timeout=timeout,
+                start_tls=False
+            )
+        else:
+            # Same as enable_starttls_auto: true
+            port, options = self.settings.SMTP_PORT, {'start_tls': True}
+        return aiosmtplib.SMTP(
+            hostname=self.settings.SMTP_HOST,
+            port=port,
+            timeout=timeout,
+            tls_context=_RELAXED_SSL_CTX,
+            **options,
+            **self._credentials()
+        )
+    
+    async def _connect(self, server: aiosmtplib.SMTP, transport: str):
+        """Connect a client from _smtp_client (encrypted transports log in while connecting)"""
+        await server.connect()
         
+        credentials = self._credentials()
+        if transport == "plain" and credentials:
+            try:
+                await server.login(credentials['username'], credentials['password'])
+            except aiosmtplib.SMTPException as e:
+                # Local delivery on port 25 works without AUTH
+                logger.info("Login not required for local SMTP: %s", e)
+    
+    async def _probe(self, transport: str) -> bool:
+        """Check whether a transport connects (and logs in) within 5 seconds"""
+        server = self._smtp_client(transport, timeout=5)
+        try:
+            await self._connect(server, transport)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.debug("SMTP transport %s unavailable: %s", transport, e)
+            return False
+        finally:
+            # Also runs when _resolve_transport cancels a losing probe mid-connect,
+            # which aiosmtplib does not clean up itself
+            server.close()
+        return True
+    
+    async def _resolve_transport(self) -> str:
+        """Probe the candidate transports once and remember the preferred one that connects"""
+        if self._transport:
+            return self._transport
+        
+        # Probe all candidates at once, then take results in preference order;
+        # once a transport wins, the slower probes are cancelled
+        probes = {transport: asyncio.create_task(self._probe(transport)) for transport in _TRANSPORTS}
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.settings.EMAIL_FROM
-            message["To"] = ", ".join(recipients)
-            message["Date"] = email_utils.formatdate(localtime=True)
-            
-            # Add HTML body
-            html_part = MIMEText(body, "html", "utf-8")
-            message.attach(html_part)
-            
-            # Log SMTP settings (without password)
-            logger.info(f"SMTP Settings - Host: {self.settings.SMTP_HOST}, Port: {self.settings.SMTP_PORT}")
-            logger.info(f"From: {self.settings.EMAIL_FROM}")
-            
-            # Use the same SMTP configuration as Redmine
-            # Port 587 with STARTTLS, login authentication, no SSL verification
+            async with asyncio.timeout(10):
+                for transport, probe in probes.items():
+                    if await probe:
+                        logger.info("Using SMTP transport: %s", transport)
+                        self._transport = transport
+                        return transport
+        except TimeoutError:
+            logger.debug("SMTP transport probing timed out")
+        finally:
+            for probe in probes.values():
+                probe.cancel()
+        
+        raise aiosmtplib.SMTPConnectError(f"No SMTP transport available for {self.settings.SMTP_HOST}")
+    
+    async def _get_conn(self) -> aiosmtplib.SMTP:
+        """Get the pooled SMTP connection, reconnecting if the server dropped it"""
+        if self._smtp is not None and self._smtp.is_connected:
             try:
-                logger.info("Using Redmine-compatible SMTP settings (Port 587 + STARTTLS)")
-                
-                # Create SSL context with relaxed verification (same as Redmine)
-                context = ssl.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE  # Same as openssl_verify_mode: none
-                
-                with smtplib.SMTP(self.settings.SMTP_HOST, self.settings.SMTP_PORT, timeout=30) as server:
-                    server.set_debuglevel(1)  # Enable debug output
-                    
-                    # Enable STARTTLS (same as enable_starttls_auto: true)
-                    server.starttls(context=context)
-                    logger.info("STARTTLS enabled")
+                await self._smtp.noop()
+                return self._smtp
+            except (aiosmtplib.SMTPException, OSError):
+                logger.debug("Pooled SMTP connection lost, reconnecting")
+        self._drop_conn()
+        
+        # Use the same SMTP configuration as Redmine
+        # Login authentication, no SSL verification
+        transport = await self._resolve_transport()
+        logger.debug("Connecting to SMTP %s (%s)", self.settings.SMTP_HOST, transport)
+        
+        server = self._smtp_client(transport)
+        await asyncio.wait_for(self._connect(server, transport), timeout=30)
+        logger.debug("SMTP connection established")
+        
+        self._smtp = server
+        return server
+    
+    def _drop_conn(self):
+        """Discard the pooled SMTP connection after a failure"""
+        if self._smtp is not None:
+            self._smtp.close()
+            self._smtp = None
+    
+    async def close(self):
+        """Close the pooled SMTP connection"""
+        async with self._lock:
+            if self._smtp is not None:
+                try:
+                    await self._smtp.quit()
+                except (aiosmtplib.SMTPException, OSError):
+                    self._smtp.close()
+                self._smtp = None
+                logger.info("SMTP connection closed")
+    
+    def _build_message(self, subject: str, body: str, recipients: List[str]) -> MIMEMultipart:
+        """Build the report email message"""
+        # SMTP policy renders CRLF line endings, so as_bytes() is already wire format
+        message = MIMEMultipart("alternative", policy=SMTP_POLICY)
+        message["Subject"] = subject
+        message["From"] = self.settings.EMAIL_FROM
+        message["To"] = ", ".join(recipients)
+        message["Date"] = email_utils.formatdate(localtime=True)
+        
+        # Add HTML body
+        message.attach(_html_part(body))
+        return message
+    
+    async def send_report_email(self, subject: str, body: str, recipients: List[str]) -> bool:
+        """Send report email to recipients"""
+        results = await self.send_many([(subject, body, recipients)])
+        return results[0]
+    
+    async def send_many(self, emails: List[Tuple[str, str, List[str]]]) -> List[bool]:
+        """
+        Send several (subject, body, recipients) emails over one SMTP session
+        
+        The session is checked once for the whole batch and each email is a
+        single MAIL FROM / RCPT TO... / DATA transaction with all recipients.
+        
+        Returns:
+            One success flag per email, in input order
+        """
+        results = []
+        async with self._lock:
+            server = None
+            for subject, body, recipients in emails:
+                logger.debug("Starting email send to %d recipients: %s", len(recipients), recipients)
+                try:
+                    message = self._build_message(subject, body, recipients)
                     
-                    # Login authentication (same as authentication: :login)
-                    if hasattr(self.settings, 'SMTP_USERNAME') and self.settings.SMTP_USERNAME:
-                        logger.info(f"Logging in with username: {self.settings.SMTP_USERNAME}")
-                        server.login(self.settings.SMTP_USERNAME, self.settings.SMTP_PASSWORD)
-                        logger.info("SMTP login successful")
+                    if server is None:
+                        server = await self._get_conn()
                     
                     # Send email
-                    server.sendmail(
+                    await server.sendmail(
                         self.settings.EMAIL_FROM,
                         recipients,
-                        message.as_string()
+                        message.as_bytes()
                     )
-                    
-                    logger.info(f"Successfully sent email to {len(recipients)} recipients using Redmine-compatible settings")
-                    return True
-                    
-            except Exception as e:
-                logger.error(f"Redmine-compatible SMTP failed: {e}")
+                    logger.info("Sent email to %d recipients", len(recipients))
+                    results.append(True)
                 
-                # Fallback: Try without STARTTLS for local MailPlus
-                try:
-                    logger.info("Trying fallback: Direct SMTP without STARTTLS")
-                    
-                    with smtplib.SMTP(self.settings.SMTP_HOST, 25, timeout=30) as server:
-                        server.set_debuglevel(1)
-                        
-                        # Try without STARTTLS for local delivery
-                        if hasattr(self.settings, 'SMTP_USERNAME') and self.settings.SMTP_USERNAME:
-                            try:
-                                server.login(self.settings.SMTP_USERNAME, self.settings.SMTP_PASSWORD)
-                            except Exception:
-                                logger.info("Login not required for local SMTP")
-                        
-                        server.sendmail(
-                            self.settings.EMAIL_FROM,
-                            recipients,
-                            message.as_string()
-                        )
-                        
-                        logger.info("Fallback method succeeded")
-                        return True
-                        
-                except Exception as e2:
-                    logger.error(f"All SMTP methods failed. Primary error: {e}, Fallback error: {e2}")
-                    return False
-            
-        except Exception as e:
-            logger.error(f"Failed to send email after trying all methods: {e}")
-            return False
+                except Exception as e:
+                    logger.error("Failed to send email: %s", e)
+                    self._drop_conn()
+                    server = None
+                    results.append(False)
+        
+        return results
     
     async def test_connection(self) -> bool:
         """Test SMTP connection"""
         try:
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.settings.SMTP_HOST, self.settings.SMTP_PORT, timeout=10) as server:
-                server.starttls(context=context)
-                if hasattr(self.settings, 'SMTP_USERNAME') and self.settings.SMTP_USERNAME:
-                    server.login(self.settings.SMTP_USERNAME, self.settings.SMTP_PASSWORD)
-                logger.info("SMTP connection test successful")
-                return True
+            async with aiosmtplib.SMTP(
+                hostname=self.settings.SMTP_HOST,
+                port=self.settings.SMTP_PORT,
+                timeout=10,
+                start_tls=True,
+                tls_context=_STRICT_SSL_CTX,
+                **self._credentials()
+            ) as server:
+                await server.noop()
+            logger.info("SMTP connection test successful")
+            return True
         except Exception as e:
-            logger.error(f"SMTP connection test failed: {e}")
-            return False
\ No newline at end of file
+            logger.error("SMTP connection test failed: %s", e)
+            return False
@@ -5,19 +5,201 @@ Photo Service
 Service for managing Synology Photos and construction site photo scanning.
 """
 
+import asyncio
+import ctypes
+import hashlib
+import heapq
+import hmac
+import importlib.util
 import logging
+import multiprocessing
 import os
-import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import cache
+from operator import attrgetter
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 from pathlib import Path
-import requests
-from PIL import Image
 import base64
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# PIL and pillow-heif are imported only by the thumbnail workers; checking
+# for pillow-heif here does not import it
+_HEIC_SUPPORTED = importlib.util.find_spec('pillow_heif') is not None
+# pyvips (libvips) is optional; when present it shrinks on load and resizes
+# with SIMD, several times faster than PIL on large camera JPEGs
+_VIPS_INSTALLED = importlib.util.find_spec('pyvips') is not None
+
+# Supported image extensions (tuple so str.endswith checks them in one call)
+_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.heic', '.heif', '.tiff', '.bmp')
+
+class ConstructionRecord(NamedTuple):
+    """One project/date folder with its photos; converted to a dict at the API boundary"""
+    project_name: str
+    construction_date: str
+    construction_description: str
+    photos: List[Dict]
+    photo_count: int
+    photos_web_url: str
+    folder_name: str
+
+# Encoded thumbnails kept in memory per PhotoService, bounded by their total
+# size (a few hundred data URIs); least recently used are evicted first
+_THUMB_MEMO_BYTES = 8 * 1024 * 1024
+
+# Folder listings kept per PhotoService (names and paths only, so small)
+_FOLDER_CACHE_SIZE = 2048
+
+# 1x1 transparent GIF shown for photos that cannot be thumbnailed
+_PLACEHOLDER_GIF = "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+# Thumbnail encodings: format -> (MIME type, PIL save options)
+_THUMB_FORMATS = {
+    'JPEG': ('image/jpeg', {'quality': 85}),
+    'WEBP': ('image/webp', {'quality': 75, 'method': 4}),
+}
+
+# Same encodings as libvips save suffixes
+_VIPS_SUFFIXES = {
+    'JPEG': '.jpg[Q=85]',
+    'WEBP': '.webp[Q=75,effort=4]',
+}
+
+# Folder names look like yyyy.mm.dd<<description>>; parsed by slicing
+# (see _parse_date_folder) rather than a regex
+
+def _parse_date_folder(name: str) -> Optional[Tuple[date, str, str]]:
+    """Parse a yyyy.mm.dd<<description>> folder name into (date, description, name)"""
+    # Cheap shape check first; most non-date names fail on length or separators
+    if len(name) < 10 or name[4] != '.' or name[7] != '.':
+        return None
+    digits = name[:4] + name[5:7] + name[8:10]
+    if not digits.isdecimal():
+        return None
+    
+    try:
+        construction_date = date(int(name[:4]), int(name[5:7]), int(name[8:10]))
+    except ValueError as e:
+        logger.warning(f"Invalid date in folder name {name}: {e}")
+        return None
+    return construction_date, name[10:].strip('<>'), name  # Remove << >> if present
+
+# statx(2) lets a stat skip revalidating attributes with the server on
+# network filesystems (NFS/SMB); mtime checks run for every folder on
+# every scan, and a slightly stale mtime only delays a cache refresh
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_MTIME = 0x40
+_STATX_SIZE = 0x200
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_int64), ('tv_nsec', ctypes.c_uint32), ('_reserved', ctypes.c_int32)]
+
+class _Statx(ctypes.Structure):
+    # struct statx from <linux/stat.h>, padded to its 256-byte size
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32), ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64), ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32), ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16), ('_spare0', ctypes.c_uint16),
+        ('stx_ino', ctypes.c_uint64), ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64), ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', _StatxTimestamp), ('stx_btime', _StatxTimestamp),
+        ('stx_ctime', _StatxTimestamp), ('stx_mtime', _StatxTimestamp),
+        ('_rest', ctypes.c_uint8 * 128),
+    ]
+
+try:
+    _statx = ctypes.CDLL(None, use_errno=True).statx
+    _statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(_Statx)]
+    _statx.restype = ctypes.c_int
+except (AttributeError, OSError):
+    # Not Linux, or a libc without statx (glibc < 2.28)
+    _statx = None
+
+def _stat_key(path: str) -> Tuple[int, int]:
+    """
+    Get a path's (mtime in ns, size) without forcing a metadata sync on network mounts
+    
+    Size is compared too because filesystems with coarse timestamps can
+    keep the mtime across a change made within the same tick.
+    """
+    if _statx is None:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    buf = _Statx()
+    if _statx(_AT_FDCWD, os.fsencode(path), _AT_STATX_DONT_SYNC, _STATX_MTIME | _STATX_SIZE, ctypes.byref(buf)) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+    return buf.stx_mtime.tv_sec * 1_000_000_000 + buf.stx_mtime.tv_nsec, buf.stx_size
+
+# Encode buffer reused across thumbnails; each worker process is
+# single-threaded, so one buffer per process is safe
+_thumb_buffer = BytesIO()
+
+@cache
+def _ensure_pil_heic() -> bool:
+    """Register pillow-heif with PIL once so iPhone photos get real thumbnails"""
+    if not _HEIC_SUPPORTED:
+        return False
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+    return True
+
+@cache
+def _load_vips():
+    """Import pyvips once per worker; None if it or the libvips library is missing"""
+    if not _VIPS_INSTALLED:
+        return None
+    try:
+        import pyvips
+    except (ImportError, OSError) as e:
+        logger.warning(f"pyvips unavailable, using PIL for thumbnails: {e}")
+        return None
+    return pyvips
+
+def _render_thumbnail(image_path: str, size: Tuple[int, int], thumb_format: str) -> bytes:
+    """Decode and resize one image to thumbnail bytes (module-level so worker processes can run it)"""
+    pyvips = _load_vips()
+    if pyvips is not None:
+        try:
+            # Fits the image inside size, decoding at reduced scale where the format allows
+            thumb = pyvips.Image.thumbnail(image_path, size[0], height=size[1])
+            return thumb.write_to_buffer(_VIPS_SUFFIXES[thumb_format])
+        except pyvips.Error as e:
+            # e.g. libvips built without HEIC support; PIL may still manage
+            logger.debug("libvips could not thumbnail %s: %s", image_path, e)
+    
+    from PIL import Image
+    _ensure_pil_heic()
+    
+    with Image.open(image_path) as img:
+        # Let the JPEG decoder scale down by 1/2, 1/4 or 1/8 while
+        # decoding (no-op for other formats); must run before load().
+        # Aim for twice the target so LANCZOS still has pixels to filter
+        # (DCT scaling alone aliases fine detail)
+        img.draft('RGB', (size[0] * 2, size[1] * 2))
+        
+        # Convert to RGB if necessary
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGB')
+        
+        # Create thumbnail
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        
+        # Save to bytes
+        _thumb_buffer.seek(0)
+        _thumb_buffer.truncate()
+        img.save(_thumb_buffer, format=thumb_format, **_THUMB_FORMATS[thumb_format][1])
+        return _thumb_buffer.getvalue()
+
 class PhotoService:
     """Service for Synology Photos and construction site photo management"""
     
@@ -35,14 +217,132 @@ class PhotoService:
         else:
             self.photos_web_url = f"https://{self.synology_host}:{self.synology_port}/photo"
         
-        # Date regex pattern for folder names: yyyy.mm.dd<<description>>
-        self.date_pattern = re.compile(r'(\d{4})\.(\d{2})\.(\d{2})(.*)')
+        # Directory scan caches keyed by path, invalidated by directory mtime
+        # and size (adding/removing a date folder or photo changes its parent)
+        self._proj_cache: Dict[str, Tuple[Tuple[int, int], List[Tuple[date, str, str, str]]]] = {}
+        # (folder path, max photos) -> (folder stat key, [(name, path), ...]), LRU;
+        # filled from scan threads, hence the lock
+        self._folder_cache: OrderedDict[Tuple[str, int], Tuple[Tuple[int, int], List[Tuple[str, str]]]] = OrderedDict()
+        self._folder_cache_lock = threading.Lock()
+        # Caps concurrent directory scans (open fds / NAS round-trips) now that
+        # projects and date folders are gathered concurrently
+        self._scan_sem = asyncio.BoundedSemaphore(16)
+        
+        # Project names under the base path, shared by both listing APIs for 30s
+        self._projects_cache: Optional[Tuple[float, Tuple[Tuple[str, str], ...]]] = None
+        
+        # Thumbnail decoding is CPU-bound, so it runs in worker processes;
+        # every uvicorn worker has its own pool, so it is kept small
+        # (THUMBNAIL_WORKERS) and created on first use so listing-only
+        # callers never start one
+        self._thumb_pool: Optional[ProcessPoolExecutor] = None
+        self._thumb_workers = max(1, getattr(settings, 'THUMBNAIL_WORKERS', 1))
+        
+        # JPEG by default: report 5 emails embed thumbnails and many mail
+        # clients (Outlook in particular) cannot display WebP
+        thumb_format = getattr(settings, 'THUMBNAIL_FORMAT', 'JPEG').upper()
+        self._thumb_format = thumb_format if thumb_format in _THUMB_FORMATS else 'JPEG'
+        
+        # Persistent thumbnail cache so each photo is decoded once, not once per scan
+        self._thumb_db_lock = threading.Lock()
+        self._thumb_db = self._open_thumb_cache(getattr(settings, 'THUMB_CACHE_DB', '/tmp/redmine_report_thumbs.db'))
+        # In-memory LRU of finished data URIs in front of the on-disk cache,
+        # keyed by (path, mtime_ns, size, thumbnail size)
+        self._thumb_memo: OrderedDict[Tuple[str, int, int, tuple], str] = OrderedDict()
+        self._thumb_memo_bytes = 0
+        # Thumbnail URL tokens carry the photo's path, mtime and size signed
+        # with SECRET_KEY, so any worker can serve them without shared state
+        self._token_key = getattr(settings, 'SECRET_KEY', '').encode()
+        
+        # Background pass that pre-renders thumbnails (see start_cache_warmer)
+        self._warm_task: Optional[asyncio.Task] = None
         
         # Initialize and validate photo path
         self._initialize_photo_path()
         
         logger.info(f"Initialized Photo service with base path: {self.photo_base_path}")
     
+    def _open_thumb_cache(self, db_path: str) -> Optional[sqlite3.Connection]:
+        """Open the on-disk thumbnail cache; thumbnails are regenerated if it is unavailable"""
+        try:
+            # Every API worker opens the same file: WAL lets readers proceed
+            # during a write and the timeout waits out another worker's commit
+            conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS thumbs(key TEXT PRIMARY KEY, data BLOB)")
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Thumbnail cache disabled ({db_path}): {e}")
+            return None
+    
+    def _thumb_cache_get(self, key: str) -> Optional[bytes]:
+        """Look up cached thumbnail bytes"""
+        if self._thumb_db is None:
+            return None
+        try:
+            with self._thumb_db_lock:
+                row = self._thumb_db.execute("SELECT data FROM thumbs WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Thumbnail cache read failed: {e}")
+            return None
+    
+    def _thumb_cache_put(self, key: str, data: bytes):
+        """Store thumbnail bytes in the cache"""
+        if self._thumb_db is None:
+            return
+        try:
+            with self._thumb_db_lock:
+                self._thumb_db.execute("INSERT OR REPLACE INTO thumbs(key, data) VALUES (?, ?)", (key, data))
+                self._thumb_db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Thumbnail cache write failed: {e}")
+    
+    async def _in_thread(self, func, *args):
+        """Run a blocking directory scan on a worker thread, bounded by the scan semaphore"""
+        async with self._scan_sem:
+            return await asyncio.to_thread(func, *args)
+    
+    def _get_thumb_pool(self) -> ProcessPoolExecutor:
+        """Get the thumbnail worker pool, starting it on first use"""
+        if self._thumb_pool is None:
+            # Workers start from a clean interpreter: forking this process would
+            # copy its memory and any lock held by one of its threads
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._thumb_pool = ProcessPoolExecutor(
+                max_workers=self._thumb_workers,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+        return self._thumb_pool
+    
+    def start_cache_warmer(self, interval: int):
+        """Walk the default photo window every interval seconds to pre-render thumbnails"""
+        if interval > 0 and self._warm_task is None:
+            self._warm_task = asyncio.create_task(self._warm_loop(interval))
+            logger.info(f"Photo cache warmer started (every {interval}s)")
+    
+    async def _warm_loop(self, interval: int):
+        """Render thumbnails for new photos into the shared on-disk cache ahead of requests"""
+        while True:
+            try:
+                # Requests still scan the folders themselves; what this pass
+                # leaves behind for every worker is the thumbnail cache file
+                records = await self.get_construction_photos()
+                logger.debug("Photo cache warmed: %d records", len(records))
+            except Exception as e:
+                logger.warning(f"Photo cache warm-up failed: {e}")
+            await asyncio.sleep(interval)
+    
+    def close(self):
+        """Stop the cache warmer and shut down the thumbnail worker processes"""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        if self._thumb_pool is not None:
+            self._thumb_pool.shutdown(wait=False, cancel_futures=True)
+            self._thumb_pool = None
+    
     def _initialize_photo_path(self):
         """Initialize and validate the photo base path"""
         logger.info(f"Validating photo base path: {self.photo_base_path}")
@@ -62,9 +362,15 @@ class PhotoService:
                 '/volume1/photo'
             ]
             
-            for alt_path in alternative_paths:
+            # Probe all candidates at once; on network storage each check is a
+            # round-trip, so checking them one by one is up to 8x slower
+            with ThreadPoolExecutor(max_workers=len(alternative_paths)) as pool:
+                path_exists = list(pool.map(os.path.exists, alternative_paths))
+            
+            # Candidates are still taken in preference order
+            for alt_path, exists in zip(alternative_paths, path_exists):
                 logger.info(f"Checking alternative path: {alt_path}")
-                if os.path.exists(alt_path):
+                if exists:
                     logger.info(f"Found alternative path: {alt_path}")
                     try:
                         # Test directory access
@@ -95,17 +401,40 @@ class PhotoService:
                 logger.info(f"Successfully validated photo path: {self.photo_base_path}")
     
     async def get_construction_photos(self, start_date: date = None, end_date: date = None, 
-                                    project_filter: str = None) -> List[Dict]:
+                                    project_filter: str = None, inline_thumbnails: bool = True) -> List[Dict]:
         """Get construction photos for specified date range and projects
         
         Args:
             start_date: Filter by construction date >= start_date
             end_date: Filter by construction date <= end_date  
             project_filter: Filter by project name (partial match)
+            inline_thumbnails: Embed thumbnails as base64 data URIs (needed for
+                emails); otherwise photos get a thumbnail_url served by get_thumbnail
         
         Returns:
             List of construction photo records
         """
+        construction_records = [
+            record async for record in self.iter_construction_photos(
+                start_date, end_date, project_filter, inline_thumbnails
+            )
+        ]
+        
+        # Sort by project name, then by date (newest first)
+        construction_records.sort(key=attrgetter('project_name', 'construction_date'), reverse=True)
+        
+        logger.info(f"Total construction photo records found: {len(construction_records)}")
+        return [record._asdict() for record in construction_records]
+    
+    async def iter_construction_photos(self, start_date: date = None, end_date: date = None,
+                                       project_filter: str = None, inline_thumbnails: bool = True
+                                       ) -> AsyncIterator[ConstructionRecord]:
+        """
+        Yield construction photo records as each project finishes scanning
+        
+        Same arguments as get_construction_photos; records come in completion
+        order, so callers that need them sorted should use get_construction_photos.
+        """
         try:
             # Set default date range to past 14 days
             if not start_date:
@@ -116,56 +445,48 @@ class PhotoService:
             logger.info(f"Scanning construction photos from {start_date} to {end_date}, project: {project_filter}")
             logger.info(f"Photo base path: {self.photo_base_path}")
             
-            # Check if base photo directory exists
-            if not os.path.exists(self.photo_base_path):
-                logger.error(f"Photo base path does not exist: {self.photo_base_path}")
-                return []
-            
-            # Check directory permissions and contents
+            # Get all project directories (a missing base path raises here,
+            # so no separate existence check is needed)
             try:
-                all_items = os.listdir(self.photo_base_path)
-                logger.info(f"Total items in photo base path: {len(all_items)}")
-                logger.info(f"First 10 items: {all_items[:10]}")
+                project_dirs = await self._list_projects_cached()
+            except (FileNotFoundError, NotADirectoryError):
+                logger.error(f"Photo base path does not exist: {self.photo_base_path}")
+                return
             except PermissionError:
                 logger.error(f"Permission denied accessing: {self.photo_base_path}")
-                return []
+                return
             except Exception as e:
                 logger.error(f"Error listing directory {self.photo_base_path}: {e}")
-                return []
-            
-            construction_records = []
+                return
             
-            # Get all project directories
-            project_dirs = []
-            for item in all_items:
-                item_path = os.path.join(self.photo_base_path, item)
-                if os.path.isdir(item_path):
-                    project_dirs.append(item)
-                    logger.info(f"Found project directory: {item}")
+            logger.info(f"Found {len(project_dirs)} project directories: {[name for name, _ in project_dirs]}")
             
-            logger.info(f"Found {len(project_dirs)} project directories: {project_dirs}")
-            
-            for project_name in project_dirs:
+            selected_projects = []
+            for project_name, project_path in project_dirs:
                 # Apply project filter
                 if project_filter and project_filter.lower() not in project_name.lower():
                     logger.info(f"Skipping project {project_name} due to filter: {project_filter}")
                     continue
-                    
-                project_path = os.path.join(self.photo_base_path, project_name)
-                logger.info(f"Processing project: {project_name} at {project_path}")
                 
-                # Get construction date folders for this project
-                project_records = await self._scan_project_photos(
-                    project_name, project_path, start_date, end_date
-                )
-                construction_records.extend(project_records)
-                logger.info(f"Found {len(project_records)} records for project {project_name}")
-            
-            # Sort by project name, then by date (newest first)
-            construction_records.sort(key=lambda x: (x['project_name'], x['construction_date']), reverse=True)
+                selected_projects.append((project_name, project_path))
+                logger.info(f"Processing project: {project_name}")
             
-            logger.info(f"Total construction photo records found: {len(construction_records)}")
-            return construction_records
+            # Scan all projects concurrently and hand each project's records
+            # on as soon as it is done
+            tasks = [
+                asyncio.create_task(self._scan_project_photos(
+                    project_name, project_path, start_date, end_date, inline_thumbnails
+                ))
+                for project_name, project_path in selected_projects
+            ]
+            try:
+                for scan in asyncio.as_completed(tasks):
+                    for record in await scan:
+                        yield record
+            finally:
+                # Consumer stopped early (or failed): don't leave scans running
+                for task in tasks:
+                    task.cancel()
             
         except Exception as e:
             logger.error(f"Error getting construction photos: {e}")
@@ -174,120 +495,137 @@ class PhotoService:
             raise
     
     async def _scan_project_photos(self, project_name: str, project_path: str, 
-                                 start_date: date, end_date: date) -> List[Dict]:
+                                 start_date: date, end_date: date,
+                                 inline_thumbnails: bool = True) -> List[ConstructionRecord]:
         """Scan a single project directory for construction photos"""
         try:
             records = []
             
-            if not os.path.exists(project_path):
+            # Get construction date folders (cached until the project folder changes);
+            # directory I/O blocks, so it runs on a worker thread
+            try:
+                date_folders = await self._in_thread(self._get_project_date_folders, project_name, project_path)
+            except (FileNotFoundError, NotADirectoryError):
                 logger.warning(f"Project path does not exist: {project_path}")
                 return records
-            
-            # Get all subdirectories (construction date folders)
-            try:
-                all_items = os.listdir(project_path)
-                date_dirs = []
-                for item in all_items:
-                    item_path = os.path.join(project_path, item)
-                    if os.path.isdir(item_path):
-                        date_dirs.append(item)
-                
-                logger.info(f"Project {project_name}: Found {len(date_dirs)} subdirectories: {date_dirs[:10]}")
             except Exception as e:
                 logger.error(f"Error listing project directory {project_path}: {e}")
                 return records
             
-            for date_dir in date_dirs:
-                # Parse date from folder name using regex
-                match = self.date_pattern.match(date_dir)
-                if not match:
-                    continue
-                    
-                try:
-                    year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                    construction_date = date(year, month, day)
-                    description = match.group(4).strip('<>')  # Remove << >> if present
+            # Folders are sorted by date, so the in-range ones are one contiguous slice
+            lo = bisect_left(date_folders, start_date, key=lambda folder: folder[0])
+            hi = bisect_right(date_folders, end_date, key=lambda folder: folder[0])
+            
+            in_range = date_folders[lo:hi]
+            
+            # Get photos from all in-range date folders concurrently
+            folder_photos = await asyncio.gather(*(
+                self._get_folder_photos(folder_path, inline_thumbnails=inline_thumbnails)
+                for _, _, _, folder_path in in_range
+            ))
+            
+            for (construction_date, description, date_dir, _), photos in zip(in_range, folder_photos):
+                # Only add record if there are photos
+                if photos and len(photos) > 0:
+                    # Generate Synology Photos web URL
+                    photos_url = self._generate_photos_url(project_name, date_dir)
                     
-                    # Check if date is in range
-                    if start_date <= construction_date <= end_date:
-                        # Get photos from this date folder
-                        date_folder_path = os.path.join(project_path, date_dir)
-                        photos = await self._get_folder_photos(date_folder_path)
-                        
-                        # Only add record if there are photos
-                        if photos and len(photos) > 0:
-                            # Generate Synology Photos web URL
-                            photos_url = await self._generate_photos_url(project_name, date_dir)
-                            
-                            record = {
-                                'project_name': project_name,
-                                'construction_date': construction_date.strftime('%Y-%m-%d'),
-                                'construction_description': description or '施工作業',
-                                'photos': photos,
-                                'photo_count': len(photos),
-                                'photos_web_url': photos_url,
-                                'folder_name': date_dir
-                            }
-                            records.append(record)
-                            logger.info(f"Added record for {project_name} on {construction_date} with {len(photos)} photos")
-                        else:
-                            logger.info(f"Skipping {project_name} on {construction_date} - no photos found")
-                        
-                except ValueError as e:
-                    logger.warning(f"Invalid date in folder name {date_dir}: {e}")
-                    continue
+                    record = ConstructionRecord(
+                        project_name=project_name,
+                        construction_date=construction_date.isoformat(),
+                        construction_description=description or '施工作業',
+                        photos=photos,
+                        photo_count=len(photos),
+                        photos_web_url=photos_url,
+                        folder_name=date_dir
+                    )
+                    records.append(record)
+                    logger.info(f"Added record for {project_name} on {construction_date} with {len(photos)} photos")
+                else:
+                    logger.info(f"Skipping {project_name} on {construction_date} - no photos found")
             
+            logger.info(f"Found {len(records)} records for project {project_name}")
             return records
             
         except Exception as e:
             logger.error(f"Error scanning project {project_name}: {e}")
             return []
     
-    async def _get_folder_photos(self, folder_path: str, max_photos: int = 3) -> List[Dict]:
+    async def _list_projects_cached(self) -> Tuple[Tuple[str, str], ...]:
+        """Get (name, path) of project directories under the base path, re-listed at most every 30 seconds"""
+        now = time.monotonic()
+        if self._projects_cache and now - self._projects_cache[0] < 30:
+            return self._projects_cache[1]
+        
+        project_dirs = await self._in_thread(self._scan_project_dirs)
+        
+        self._projects_cache = (now, project_dirs)
+        return project_dirs
+    
+    def _scan_project_dirs(self) -> Tuple[Tuple[str, str], ...]:
+        """List (name, path) of project directories under the base path (blocking)"""
+        with os.scandir(self.photo_base_path) as it:
+            # DirEntry.is_dir() uses the type from readdir, no extra stat;
+            # DirEntry.path is already joined, so callers skip os.path.join.
+            # A tuple, so callers sharing the cached listing cannot alter it
+            return tuple((item.name, item.path) for item in it if item.is_dir())
+    
+    def _get_project_date_folders(self, project_name: str, project_path: str) -> List[Tuple[date, str, str, str]]:
+        """Get parsed (construction_date, description, folder_name, folder_path) tuples for a project"""
+        project_key = _stat_key(project_path)
+        cached = self._proj_cache.get(project_path)
+        if cached and cached[0] == project_key:
+            return cached[1]
+        
+        # Get all subdirectories (construction date folders)
+        with os.scandir(project_path) as it:
+            date_dirs = [item for item in it if item.is_dir()]
+        
+        logger.info(f"Project {project_name}: Found {len(date_dirs)} subdirectories: {[item.name for item in date_dirs[:10]]}")
+        
+        date_folders = []
+        for date_dir in date_dirs:
+            folder = _parse_date_folder(date_dir.name)
+            if folder:
+                date_folders.append((*folder, date_dir.path))
+        
+        date_folders.sort(key=lambda folder: folder[0])
+        self._proj_cache[project_path] = (project_key, date_folders)
+        return date_folders
+    
+    async def _get_folder_photos(self, folder_path: str, max_photos: int = 3,
+                                 inline_thumbnails: bool = True) -> List[Dict]:
         """Get photos from a construction date folder"""
         try:
             photos = []
             
-            if not os.path.exists(folder_path):
+            # Directory I/O blocks, so it runs on a worker thread
+            selected = await self._in_thread(self._list_folder_images, folder_path, max_photos)
+            if not selected:
                 return photos
             
-            # Supported image extensions
-            image_extensions = {'.jpg', '.jpeg', '.png', '.heic', '.heif', '.tiff', '.bmp'}
-            
-            # Get all image files
-            image_files = []
-            for file in os.listdir(folder_path):
-                if any(file.lower().endswith(ext) for ext in image_extensions):
-                    image_files.append(file)
-            
-            # Sort files by name and take first N photos
-            image_files.sort()
-            selected_files = image_files[:max_photos]
+            if inline_thumbnails:
+                # Generate the folder's thumbnails in parallel; folders of all
+                # projects are gathered too, so every worker is kept busy
+                thumbnails = await asyncio.gather(*(
+                    self._generate_thumbnail(image_path, stat) for _, image_path, stat in selected
+                ))
+            else:
+                # Rendered on request by get_thumbnail, only for photos a client shows
+                thumbnails = [None] * len(selected)
             
-            for filename in selected_files:
-                file_path = os.path.join(folder_path, filename)
-                
-                try:
-                    # Get file info
-                    stat = os.stat(file_path)
-                    file_size = stat.st_size
-                    modified_time = datetime.fromtimestamp(stat.st_mtime)
-                    
-                    # Generate thumbnail
-                    thumbnail_data = await self._generate_thumbnail(file_path)
-                    
-                    photo_info = {
-                        'filename': filename,
-                        'file_path': file_path,
-                        'file_size': file_size,
-                        'modified_time': modified_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'thumbnail_base64': thumbnail_data
-                    }
-                    photos.append(photo_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing photo {file_path}: {e}")
-                    continue
+            for (filename, image_path, stat), thumbnail_data in zip(selected, thumbnails):
+                photo_info = {
+                    'filename': filename,
+                    'file_path': image_path,
+                    'file_size': stat.st_size,
+                    'modified_time': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+                }
+                if inline_thumbnails:
+                    photo_info['thumbnail_base64'] = thumbnail_data
+                else:
+                    photo_info['thumbnail_url'] = f"/api/report5/thumbnail/{self._thumb_token(image_path, stat)}"
+                photos.append(photo_info)
             
             return photos
             
@@ -295,42 +633,172 @@ class PhotoService:
             logger.error(f"Error getting folder photos from {folder_path}: {e}")
             return []
     
-    async def _generate_thumbnail(self, image_path: str, size: tuple = (200, 150)) -> str:
-        """Generate base64 thumbnail for image"""
+    def _list_folder_images(self, folder_path: str, max_photos: int) -> List[Tuple[str, str, os.stat_result]]:
+        """
+        List (name, path, stat) of the first N images of a folder (blocking)
+        
+        The listing is reused while the folder's mtime and size are unchanged;
+        the photos themselves are always re-stated, since editing a file in
+        place leaves its folder untouched. Returns [] if the folder is missing.
+        """
         try:
-            # For HEIC files, we might need special handling
-            if image_path.lower().endswith(('.heic', '.heif')):
-                # Return a placeholder for HEIC files since PIL might not support them
-                return self._get_placeholder_thumbnail()
-            
-            # Open and resize image
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Create thumbnail
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                
-                # Save to bytes
-                buffer = BytesIO()
-                img.save(buffer, format='JPEG', quality=85)
-                
-                # Encode to base64
-                thumbnail_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-                return f"data:image/jpeg;base64,{thumbnail_data}"
-                
-        except Exception as e:
-            logger.warning(f"Error generating thumbnail for {image_path}: {e}")
+            folder_key = _stat_key(folder_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        
+        cache_key = (folder_path, max_photos)
+        with self._folder_cache_lock:
+            cached = self._folder_cache.get(cache_key)
+            if cached:
+                self._folder_cache.move_to_end(cache_key)
+        if cached and cached[0] == folder_key:
+            try:
+                return [(name, image_path, os.stat(image_path)) for name, image_path in cached[1]]
+            except OSError:
+                pass  # A photo disappeared without the folder changing yet; list again
+        
+        # Take the first N image files by name without sorting the whole folder
+        with os.scandir(folder_path) as it:
+            selected_files = heapq.nsmallest(
+                max_photos,
+                (entry for entry in it if entry.name.lower().endswith(_IMAGE_EXTS)),
+                key=lambda entry: entry.name
+            )
+        
+        # Get file info (cached on the DirEntry where the platform provides it)
+        selected = []
+        for entry in selected_files:
+            try:
+                selected.append((entry.name, entry.path, entry.stat()))
+            except OSError as e:
+                logger.warning(f"Error processing photo {entry.path}: {e}")
+        
+        with self._folder_cache_lock:
+            self._folder_cache[cache_key] = (folder_key, [(name, image_path) for name, image_path, _ in selected])
+            if len(self._folder_cache) > _FOLDER_CACHE_SIZE:
+                self._folder_cache.popitem(last=False)
+        return selected
+    
+    async def _generate_thumbnail(self, image_path: str, stat: os.stat_result, size: tuple = (200, 150)) -> str:
+        """Generate base64 thumbnail for image"""
+        # Without pillow-heif PIL cannot open HEIC/HEIF files
+        if not _HEIC_SUPPORTED and image_path.lower().endswith(('.heic', '.heif')):
+            return self._get_placeholder_thumbnail()
+        
+        # A changed file gets a new key, so stale entries are never returned
+        memo_key = (image_path, stat.st_mtime_ns, stat.st_size, size)
+        thumbnail = self._thumb_memo.get(memo_key)
+        if thumbnail is not None:
+            self._thumb_memo.move_to_end(memo_key)
+            return thumbnail
+        
+        cached = await self._thumbnail_bytes(image_path, stat, size)
+        if cached is None:
             return self._get_placeholder_thumbnail()
+        
+        # Encode to base64
+        mime_type = _THUMB_FORMATS[self._thumb_format][0]
+        thumbnail_data = base64.b64encode(cached).decode('ascii')
+        thumbnail = f"data:{mime_type};base64,{thumbnail_data}"
+        
+        self._thumb_memo[memo_key] = thumbnail
+        self._thumb_memo_bytes += len(thumbnail)
+        while self._thumb_memo_bytes > _THUMB_MEMO_BYTES:
+            _, evicted = self._thumb_memo.popitem(last=False)
+            self._thumb_memo_bytes -= len(evicted)
+        return thumbnail
+    
+    async def _thumbnail_bytes(self, image_path: str, stat: os.stat_result, size: tuple) -> Optional[bytes]:
+        """Get encoded thumbnail bytes from the on-disk cache or a worker process; None on failure"""
+        cache_key = f"{image_path}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}|{self._thumb_format}"
+        cached = self._thumb_cache_get(cache_key)
+        if cached is None:
+            try:
+                # Decode and resize in a worker process
+                loop = asyncio.get_running_loop()
+                cached = await loop.run_in_executor(
+                    self._get_thumb_pool(), _render_thumbnail, image_path, size, self._thumb_format
+                )
+            except Exception as e:
+                logger.warning(f"Error generating thumbnail for {image_path}: {e}")
+                return None
+            
+            # Cache the raw image bytes (base64 would be a third larger on disk)
+            self._thumb_cache_put(cache_key, cached)
+        return cached
+    
+    def _token_signature(self, payload: bytes) -> str:
+        """HMAC-SHA256 of a token payload, truncated to 128 bits"""
+        digest = hmac.new(self._token_key, payload, hashlib.sha256).digest()[:16]
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+    
+    def _thumb_token(self, image_path: str, stat: os.stat_result) -> str:
+        """Get the signed thumbnail URL token of a scanned photo"""
+        # The token changes with the file, so clients may cache thumbnails freely
+        relative_path = os.path.relpath(image_path, self.photo_base_path)
+        payload = f"{relative_path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode()
+        encoded = base64.urlsafe_b64encode(payload).rstrip(b'=').decode('ascii')
+        return f"{encoded}.{self._token_signature(payload)}"
+    
+    def _resolve_thumb_token(self, token: str) -> Optional[Tuple[str, os.stat_result]]:
+        """
+        Verify a thumbnail token and re-stat its photo (blocking)
+        
+        Returns:
+            (path, stat), or None if the signature is wrong, the path leaves
+            the photo base path, or the photo changed since it was listed
+        """
+        encoded, _, signature = token.partition('.')
+        try:
+            payload = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+        except ValueError:
+            return None
+        # Compared as bytes: compare_digest rejects non-ASCII str
+        if not hmac.compare_digest(signature.encode(), self._token_signature(payload).encode()):
+            return None
+        
+        try:
+            relative_path, mtime_ns, size = payload.decode().split('\0')
+            base_path = os.path.realpath(self.photo_base_path)
+            image_path = os.path.realpath(os.path.join(base_path, relative_path))
+            if os.path.commonpath((base_path, image_path)) != base_path:
+                return None
+            stat = os.stat(image_path)
+        except (ValueError, OSError):
+            return None
+        
+        # A changed photo is listed with a new token
+        if stat.st_mtime_ns != int(mtime_ns) or stat.st_size != int(size):
+            return None
+        return image_path, stat
+    
+    async def get_thumbnail(self, token: str, size: tuple = (200, 150)) -> Optional[Tuple[bytes, str]]:
+        """
+        Get (image bytes, MIME type) for a thumbnail_url token
+        
+        Returns:
+            None if the token is invalid or its photo is gone or changed
+        """
+        photo = await self._in_thread(self._resolve_thumb_token, token)
+        if photo is None:
+            return None
+        image_path, stat = photo
+        
+        if not _HEIC_SUPPORTED and image_path.lower().endswith(('.heic', '.heif')):
+            data = None
+        else:
+            data = await self._thumbnail_bytes(image_path, stat, size)
+        if data is None:
+            return base64.b64decode(_PLACEHOLDER_GIF), 'image/gif'
+        return data, _THUMB_FORMATS[self._thumb_format][0]
     
     def _get_placeholder_thumbnail(self) -> str:
         """Get placeholder thumbnail for unsupported image formats"""
         # Simple 1x1 transparent image
-        placeholder = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+        placeholder = f"data:image/gif;base64,{_PLACEHOLDER_GIF}"
         return placeholder
     
-    async def _generate_photos_url(self, project_name: str, date_folder: str) -> str:
+    def _generate_photos_url(self, project_name: str, date_folder: str) -> str:
         """Generate Synology Photos web URL for the folder"""
         try:
             # Since we don't have the actual folder ID from Synology Photos API,
@@ -353,31 +821,23 @@ class PhotoService:
         try:
             logger.info(f"Getting available projects from: {self.photo_base_path}")
             
-            if not os.path.exists(self.photo_base_path):
-                logger.error(f"Photo base path does not exist: {self.photo_base_path}")
-                return []
-            
             projects = []
             try:
-                all_items = os.listdir(self.photo_base_path)
-                project_dirs = []
-                for item in all_items:
-                    item_path = os.path.join(self.photo_base_path, item)
-                    if os.path.isdir(item_path):
-                        project_dirs.append(item)
+                try:
+                    project_dirs = await self._list_projects_cached()
+                except (FileNotFoundError, NotADirectoryError):
+                    logger.error(f"Photo base path does not exist: {self.photo_base_path}")
+                    return []
                 
-                logger.info(f"Found {len(project_dirs)} potential project directories: {project_dirs}")
+                logger.info(f"Found {len(project_dirs)} potential project directories: {[name for name, _ in project_dirs]}")
                 
-                for project_dir in project_dirs:
-                    project_path = os.path.join(self.photo_base_path, project_dir)
-                    
-                    # Count construction date folders
+                for project_dir, project_path in project_dirs:
+                    # Count construction date folders; shares the mtime-keyed cache
+                    # with the photo scan, so unchanged projects cost one stat
                     try:
-                        all_subdirs = os.listdir(project_path)
-                        date_folders = [d for d in all_subdirs 
-                                      if os.path.isdir(os.path.join(project_path, d)) and self.date_pattern.match(d)]
+                        date_folders = await self._in_thread(self._get_project_date_folders, project_dir, project_path)
                         
-                        logger.info(f"Project {project_dir}: {len(date_folders)} date folders out of {len(all_subdirs)} total subdirs")
+                        logger.info(f"Project {project_dir}: {len(date_folders)} date folders")
                         
                         projects.append({
                             'name': project_dir,
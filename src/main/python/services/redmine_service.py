@@ -8,9 +8,15 @@ statistics, and journal entries for due date change tracking.
 
 import asyncio
 import logging
+import sys
+import time
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional
+from functools import partial
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple
 from redminelib import Redmine
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 try:
     from redminelib.exceptions import RedmineError
 except ImportError:
@@ -19,6 +25,93 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Redmine returns at most 100 records per list request
+_PAGE_SIZE = 100
+# Page requests in flight per query, so a large report doesn't flood Redmine
+_PAGE_CONCURRENCY = 4
+
+# Keep-alive connections to Redmine; covers concurrent pages, role prefetches
+# and the gathered dashboard counts without queueing on the pool
+_HTTP_POOL_SIZE = 16
+
+# (property, name) of a journal detail recording a due date change
+_DUE_DATE_DETAIL = ('attr', 'due_date')
+
+def _name(obj, attr: str, default: str = '') -> str:
+    """Name of a related resource (project, status, ...), or default when it is missing"""
+    value = getattr(obj, attr, None)
+    if value is None:
+        return default
+    name = getattr(value, 'name', default)
+    # Every issue carries its own copy of a handful of distinct names; interned,
+    # rows share one string each and hash/compare by identity when grouped
+    return sys.intern(name) if isinstance(name, str) else name
+
+# Row dates use fixed formats; field formatting avoids strftime's per-call
+# format parsing and locale handling
+def _format_date(value: date) -> str:
+    """Format as YYYY-MM-DD"""
+    return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+
+def _format_datetime(value: datetime) -> str:
+    """Format as YYYY-MM-DD HH:MM"""
+    return f"{value.year:04d}-{value.month:02d}-{value.day:02d} {value.hour:02d}:{value.minute:02d}"
+
+def _count_of(resources) -> int:
+    """Evaluate a limit=1 query and return Redmine's total_count for it"""
+    # Only the first (one-item) page is requested; total_count arrives with it
+    next(iter(resources), None)
+    return resources.total_count
+
+# Report status columns in display order
+_STATUS_ORDER = ('擬定中', '執行中', '簽核中', '已完成(結案)', '撤回', '暫停', '取消')
+# Statuses that are aggregated into "簽核中"
+_APPROVAL_STATUSES = frozenset(['簽核中', '審查中', '已審核', '已覆審(工廠)', '已覆審'])
+# Status name -> statistics column; approval statuses all count towards
+# 簽核中 and statuses outside the report are not counted
+_STATUS_COLUMNS = {status: column for column, status in enumerate(_STATUS_ORDER)}
+_STATUS_COLUMNS.update(dict.fromkeys(_APPROVAL_STATUSES, _STATUS_ORDER.index('簽核中')))
+
+# Name keywords -> role, checked in order against the lowercased user name
+# (customize these role mappings based on your organization)
+_ROLE_KEYWORDS = (
+    ('管理階層', ('manager', '經理', '主管')),
+    ('工程師', ('engineer', '工程師')),
+    ('系統管理員', ('admin', '管理員')),
+)
+
+# Concurrent user lookups when prefetching assignee roles
+_USER_FETCH_CONCURRENCY = 8
+
+# Dashboard counts are reused for a minute; every page load asks for them
+_COUNT_CACHE_TTL = 60
+
+# Resolved roles are reused for an hour; group membership rarely changes
+_ROLE_CACHE_TTL = 3600
+
+# Issue statuses are near-static Redmine configuration
+_STATUS_CACHE_TTL = 300
+
+# Report 1 table 2 columns; the first five are the sort order
+_ISSUE_LIST_FIELDS = (
+    'project', 'priority', 'tracker', 'assigned_to', 'status',
+    'subject', 'due_date', 'start_date', 'updated_on'
+)
+_ISSUE_LIST_SORT_KEY = itemgetter(slice(0, 5))
+
+# Short-form filter operators, matched as value prefixes the way Redmine does
+_SHORT_OPERATORS = ('><', '>=', '<=', '!*', '!', '*', 'o', 'c')
+
+def _long_form_filters(filters: Dict[str, str]) -> Dict[str, Any]:
+    """Convert short-form issue filters (status_id='*', due_date='><a|b') to f[]/op[]/v[] parameters"""
+    params = {'f[]': list(filters)}
+    for field, expression in filters.items():
+        operator = next((op for op in _SHORT_OPERATORS if expression.startswith(op)), '=')
+        values = expression if operator == '=' else expression[len(operator):]
+        params[f'op[{field}]'] = operator
+        params[f'v[{field}][]'] = values.split('|') if values else ['']
+    return params
+
 class RedmineService:
     """Service for Redmine API operations"""
     
@@ -29,60 +122,171 @@ class RedmineService:
             key=settings.REDMINE_API_KEY,
             timeout=getattr(settings, 'REDMINE_TIMEOUT', 30)
         )
+        self._configure_session(self.redmine.engine.session)
         
         # Define status order and aggregation logic
-        self.status_order = [
-            '擬定中', '執行中', '簽核中', '已完成(結案)', 
-            '撤回', '暫停', '取消'
-        ]
+        self.status_order = list(_STATUS_ORDER)
         
         # Statuses that are aggregated into "簽核中"
-        self.approval_statuses = ['簽核中', '審查中', '已審核', '已覆審(工廠)', '已覆審']
+        self.approval_statuses = _APPROVAL_STATUSES
         
         # Special project configuration for Report 3
         self.special_project_id = 'a55700'  # 專項用 project ID
         self.special_project_ids = set()  # Will be populated with parent + sub-project IDs
+        self._special_project_numeric_ids: List[str] = []  # Same family as Redmine project IDs, for filters
+        
+        # Dashboard counts by name -> (fetched at, count)
+        self._count_cache: Dict[str, tuple] = {}
+        
+        # Issue statuses change rarely; cached with the open-status filter value
+        self._statuses_cache: Optional[List[Dict]] = None
+        self._statuses_cache_time = 0.0
+        self._open_status_ids_str = ''
+        
+        # User role by user ID; resolving a role may fetch the user's groups
+        self._role_cache: Dict[Any, str] = {}
+        self._role_cache_time = time.monotonic()
         
         # Initialize special project IDs (parent + all sub-projects)
         self._initialize_special_project_ids()
         
         logger.info(f"Initialized Redmine service for {settings.REDMINE_URL}")
     
+    @staticmethod
+    def _configure_session(session):
+        """Size the keep-alive pool, retry transient gateway errors and accept gzip"""
+        # Only idempotent GETs are retried; writes must never be replayed
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        # python-redmine replaces the session headers with its own dict, which
+        # drops requests' default Accept-Encoding; JSON lists compress well
+        session.headers.setdefault('Accept-Encoding', 'gzip, deflate')
+    
+    def close(self):
+        """Close the pooled HTTP session used for all Redmine API calls"""
+        session = getattr(self.redmine.engine, 'session', None)
+        if session is not None:
+            session.close()
+    
+    async def aclose(self):
+        """Async alias of close() for use in async shutdown paths"""
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     def _initialize_special_project_ids(self):
         """Initialize special project IDs by querying Redmine for parent and sub-projects"""
         try:
             # Add the main special project ID
             self.special_project_ids.add(self.special_project_id)
             
-            # Query all projects to find sub-projects
-            all_projects = self.redmine.project.all()
-            
-            for project in all_projects:
-                # Check if this project is a sub-project of our special project
-                if hasattr(project, 'parent') and project.parent:
-                    parent_id = str(getattr(project.parent, 'id', ''))
-                    if parent_id == self.special_project_id:
-                        # This is a direct sub-project
-                        self.special_project_ids.add(str(project.id))
-                        logger.info(f"Found sub-project: {project.name} (ID: {project.id})")
-                
-                # Also check for nested sub-projects (sub-projects of sub-projects)
-                project_id = str(project.id)
-                if project_id in self.special_project_ids and hasattr(project, 'parent'):
-                    # This project is already in our special projects, check for its children
-                    for child_project in all_projects:
-                        if hasattr(child_project, 'parent') and child_project.parent:
-                            child_parent_id = str(getattr(child_project.parent, 'id', ''))
-                            if child_parent_id == project_id:
-                                self.special_project_ids.add(str(child_project.id))
-                                logger.info(f"Found nested sub-project: {child_project.name} (ID: {child_project.id})")
+            # Query all projects once and index them by parent; the special
+            # project may be configured by identifier or by numeric ID
+            root_id = None
+            children = {}
+            for project in self.redmine.project.all():
+                if self.special_project_id in (str(project.id), getattr(project, 'identifier', None)):
+                    root_id = project.id
+                parent = getattr(project, 'parent', None)
+                if parent is not None:
+                    children.setdefault(parent.id, []).append(project)
+            
+            # Walk sub-projects at any depth
+            pending = [root_id] if root_id is not None else []
+            while pending:
+                project_id = pending.pop()
+                self.special_project_ids.add(str(project_id))
+                self._special_project_numeric_ids.append(str(project_id))
+                for child_project in children.get(project_id, ()):
+                    logger.info(f"Found sub-project: {child_project.name} (ID: {child_project.id})")
+                    pending.append(child_project.id)
             
+            if root_id is None:
+                logger.warning(f"Special project {self.special_project_id} not found in Redmine")
             logger.info(f"Special project IDs initialized: {self.special_project_ids}")
             
         except Exception as e:
             logger.error(f"Error initializing special project IDs: {e}")
             # Fallback to just the main project
             self.special_project_ids = {self.special_project_id}
+            self._special_project_numeric_ids = []
+    
+    def _excluding_special_projects(self, **filters) -> Dict[str, Any]:
+        """
+        Add a server-side "project is not 專項用" condition to short-form issue filters
+        
+        Redmine reads project_id as the project context, so negation needs the
+        long f[]/op[]/v[] filter form; without resolved IDs the filters are
+        returned unchanged.
+        """
+        return self._with_special_project_condition('!', filters)
+    
+    def _within_special_projects(self, **filters) -> Dict[str, Any]:
+        """
+        Add a server-side "project is 專項用" condition to short-form issue filters
+        
+        Without resolved IDs the filters are returned unchanged and
+        _should_exclude_issue drops everything, as before.
+        """
+        return self._with_special_project_condition('=', filters)
+    
+    def _with_special_project_condition(self, operator: str, filters: Dict[str, str]) -> Dict[str, Any]:
+        """Long-form filters plus a project_id condition on the 專項用 family"""
+        if not self._special_project_numeric_ids:
+            return filters
+        params = _long_form_filters(filters)
+        params['f[]'].append('project_id')
+        params['op[project_id]'] = operator
+        params['v[project_id][]'] = self._special_project_numeric_ids
+        return params
+    
+    async def _fetch_issues(self, **filters) -> List:
+        """
+        Fetch every issue matching the filters
+        
+        The first page gives total_count; the remaining pages are then
+        requested concurrently instead of one after another. python-redmine
+        is blocking, so each page request runs on a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        
+        def fetch_page(offset: int):
+            page = self.redmine.issue.filter(**filters, limit=_PAGE_SIZE, offset=offset)
+            return list(page), page.total_count
+        
+        issues, total_count = await loop.run_in_executor(None, fetch_page, 0)
+        if total_count <= _PAGE_SIZE:
+            return issues
+        
+        semaphore = asyncio.Semaphore(_PAGE_CONCURRENCY)
+        
+        async def fetch_rest(offset: int) -> List:
+            async with semaphore:
+                page, _ = await loop.run_in_executor(None, fetch_page, offset)
+                return page
+        
+        # Pages come back in offset order, so a requested sort is preserved
+        pages = await asyncio.gather(*(
+            fetch_rest(offset) for offset in range(_PAGE_SIZE, total_count, _PAGE_SIZE)
+        ))
+        for page in pages:
+            issues.extend(page)
+        
+        logger.debug("Fetched %d issues in %d pages", len(issues), len(pages) + 1)
+        return issues
     
     def _should_exclude_issue(self, issue, for_special_project=False) -> bool:
         """Check if an issue should be excluded based on project"""
@@ -112,64 +316,19 @@ class RedmineService:
         """
         try:
             # Get issues within date range that are in progress
-            issues = self.redmine.issue.filter(
-                updated_on=f">={start_date.strftime('%Y-%m-%d')}",
-                created_on=f"<={end_date.strftime('%Y-%m-%d')}",
-                status_id='*',  # All statuses
-                include=['journals']
+            # 專項用 projects are excluded by Redmine itself
+            issues = await self._fetch_issues(
+                **self._excluding_special_projects(
+                    updated_on=f">={start_date.strftime('%Y-%m-%d')}",
+                    created_on=f"<={end_date.strftime('%Y-%m-%d')}",
+                    status_id='*'  # All statuses
+                )
             )
             
-            # Process statistics by role, assignee and status
-            stats = {}
+            # Resolve every assignee's role up front, one request per user
+            await self._prefetch_user_roles(issues)
             
-            for issue in issues:
-                # Skip excluded projects
-                if self._should_exclude_issue(issue):
-                    continue
-                assignee = issue.assigned_to.name if hasattr(issue, 'assigned_to') else '未分派'
-                status = issue.status.name if hasattr(issue, 'status') else '未知狀態'
-                
-                # Get user role/group - for now use a simple mapping or custom field
-                # This can be enhanced to get actual Redmine user groups/roles
-                role = self._get_user_role(issue.assigned_to if hasattr(issue, 'assigned_to') else None)
-                
-                key = (role, assignee)
-                if key not in stats:
-                    stats[key] = {}
-                
-                if status not in stats[key]:
-                    stats[key][status] = 0
-                
-                stats[key][status] += 1
-            
-            # Convert to list format for frontend with status aggregation
-            result = []
-            for (role, assignee), statuses in stats.items():
-                row = {
-                    'role': role,
-                    'assignee': assignee
-                }
-                
-                # Initialize all status columns with 0
-                for status in self.status_order:
-                    row[status] = 0
-                
-                # Calculate "簽核中" aggregation
-                approval_count = 0
-                for status_name, count in statuses.items():
-                    if status_name in self.approval_statuses:
-                        approval_count += count
-                        # Don't add individual approval statuses to display, only the aggregated one
-                    elif status_name in self.status_order:
-                        row[status_name] = count
-                
-                # Set the aggregated "簽核中" count
-                row['簽核中'] = approval_count
-                
-                result.append(row)
-            
-            # Sort by role, then by assignee
-            result.sort(key=lambda x: (x['role'], x['assignee']))
+            result = self._tabulate_statistics(issues)
             
             logger.info(f"Retrieved statistics for {len(result)} assignees with status aggregation")
             return result
@@ -181,6 +340,42 @@ class RedmineService:
             logger.error(f"Error in get_issue_statistics: {e}")
             raise
     
+    def _tabulate_statistics(self, issues: List) -> List[Dict]:
+        """
+        Count issues per (role, assignee) in the report status columns
+        
+        Each group accumulates into a list indexed by status column, so the
+        rows need no pivot: they are the column names zipped with the counts.
+        Roles should already be prefetched.
+        """
+        width = len(_STATUS_ORDER)
+        groups: Dict[tuple, List[int]] = {}
+        
+        for issue in issues:
+            # One attribute lookup each; missing attributes fall back to None
+            assigned_to = getattr(issue, 'assigned_to', None)
+            assignee = sys.intern(assigned_to.name) if assigned_to is not None else '未分派'
+            
+            # Get user role/group - for now use a simple mapping or custom field
+            # This can be enhanced to get actual Redmine user groups/roles
+            role = self._get_user_role(assigned_to)
+            
+            counts = groups.get((role, assignee))
+            if counts is None:
+                counts = groups[(role, assignee)] = [0] * width
+            
+            column = _STATUS_COLUMNS.get(_name(issue, 'status'))
+            if column is not None:
+                counts[column] += 1
+        
+        # Convert to list format for frontend, sorted by role, then by assignee
+        result = [
+            {'role': role, 'assignee': assignee, **dict(zip(_STATUS_ORDER, counts))}
+            for (role, assignee), counts in groups.items()
+        ]
+        result.sort(key=itemgetter('role', 'assignee'))
+        return result
+    
     async def get_issue_list(self, start_date: date, end_date: date) -> List[Dict]:
         """
         Get detailed issue list for issues due within the date range
@@ -188,38 +383,40 @@ class RedmineService:
         """
         try:
             # Get issues with due dates within the range
-            issues = self.redmine.issue.filter(
-                due_date=f"><{start_date.strftime('%Y-%m-%d')}|{end_date.strftime('%Y-%m-%d')}",
-                status_id='*',
-                sort='due_date:asc',
-                include=['journals']
+            # 專項用 projects are excluded by Redmine itself
+            issues = await self._fetch_issues(
+                **self._excluding_special_projects(
+                    due_date=f"><{start_date.strftime('%Y-%m-%d')}|{end_date.strftime('%Y-%m-%d')}",
+                    status_id='*'
+                ),
+                sort='due_date:asc'
             )
             
-            result = []
+            # Rows are built as tuples (fields in _ISSUE_LIST_FIELDS order) and
+            # only turned into dicts once sorted
+            rows = []
+            append = rows.append
             for issue in issues:
-                # Skip excluded projects
-                if self._should_exclude_issue(issue):
-                    continue
-                result.append({
-                    'project': issue.project.name if hasattr(issue, 'project') else '',
-                    'priority': issue.priority.name if hasattr(issue, 'priority') else '',
-                    'tracker': issue.tracker.name if hasattr(issue, 'tracker') else '',
-                    'assigned_to': issue.assigned_to.name if hasattr(issue, 'assigned_to') else '未分派',
-                    'status': issue.status.name if hasattr(issue, 'status') else '',
-                    'subject': issue.subject,
-                    'due_date': issue.due_date.strftime('%Y-%m-%d') if hasattr(issue, 'due_date') and issue.due_date else '',
-                    'start_date': issue.start_date.strftime('%Y-%m-%d') if hasattr(issue, 'start_date') and issue.start_date else '',
-                    'updated_on': issue.updated_on.strftime('%Y-%m-%d %H:%M') if hasattr(issue, 'updated_on') else ''
-                })
+                # Fetch each optional date once instead of hasattr + two reads
+                due_date = getattr(issue, 'due_date', None)
+                start_date = getattr(issue, 'start_date', None)
+                updated_on = getattr(issue, 'updated_on', None)
+                append((
+                    _name(issue, 'project'),
+                    _name(issue, 'priority'),
+                    _name(issue, 'tracker'),
+                    _name(issue, 'assigned_to', '未分派'),
+                    _name(issue, 'status'),
+                    issue.subject,
+                    _format_date(due_date) if due_date else '',
+                    _format_date(start_date) if start_date else '',
+                    _format_datetime(updated_on) if updated_on is not None else ''
+                ))
             
-            # Sort by project, priority, tracker, assigned_to, status
-            result.sort(key=lambda x: (
-                x['project'], 
-                x['priority'], 
-                x['tracker'], 
-                x['assigned_to'], 
-                x['status']
-            ))
+            # Sort by project, priority, tracker, assigned_to, status (the
+            # first five fields; ties keep Redmine's due date order)
+            rows.sort(key=_ISSUE_LIST_SORT_KEY)
+            result = [dict(zip(_ISSUE_LIST_FIELDS, row)) for row in rows]
             
             logger.info(f"Retrieved {len(result)} issues for detailed list")
             return result
@@ -241,60 +438,54 @@ class RedmineService:
             date_str = update_date.strftime('%Y-%m-%d')
             
             # First get all issues updated on the target date
-            issues = self.redmine.issue.filter(
-                updated_on=date_str,
-                status_id='o' if status_filter == 'open' else '*',
+            # (專項用 projects are excluded by Redmine itself); journals are
+            # only requested here, the one report that reads them
+            issues = await self._fetch_issues(
+                **self._excluding_special_projects(
+                    updated_on=date_str,
+                    status_id='o' if status_filter == 'open' else '*'
+                ),
                 include=['journals']
             )
             
-            result = []
+            # (sort key, row) pairs; the key is built once per row
+            keyed_rows = []
             
             for issue in issues:
-                # Skip excluded projects
-                if self._should_exclude_issue(issue):
-                    continue
-                    
                 # Check journals for due date changes
                 due_date_changes = self._extract_due_date_changes(issue, update_date)
                 
                 if due_date_changes:
+                    # Issue fields are the same for every change of the issue
+                    project = _name(issue, 'project')
+                    priority = _name(issue, 'priority')
+                    assigned_to = _name(issue, 'assigned_to', '未分派')
+                    
                     for change in due_date_changes:
-                        # Calculate date adjustment
-                        days_adjustment = self._calculate_days_adjustment(
+                        # Calculate date adjustment; the day count is kept for sorting
+                        days_adjustment, days_num = self._calculate_days_adjustment(
                             change['old_date'], 
                             change['new_date']
                         )
                         
-                        result.append({
-                            'project': issue.project.name if hasattr(issue, 'project') else '',
-                            'priority': issue.priority.name if hasattr(issue, 'priority') else '',
+                        row = {
+                            'project': project,
+                            'priority': priority,
                             'subject': issue.subject,
                             'modifier': change['user'],
-                            'assigned_to': issue.assigned_to.name if hasattr(issue, 'assigned_to') else '未分派',
+                            'assigned_to': assigned_to,
                             'new_due_date': change['new_date'],
                             'old_due_date': change['old_date'],
                             'days_adjustment': days_adjustment,
                             'change_date': change['change_date']
-                        })
-            
-            # Sort by project, adjustment days desc, priority, assigned_to
-            def sort_key(x):
-                # Extract numeric value from days_adjustment for proper sorting
-                days_str = x['days_adjustment']
-                if days_str == "N/A":
-                    days_num = 0  # Treat N/A as 0 for sorting
-                else:
-                    # Extract number from "+5天" or "-3天" format
-                    days_num = int(days_str.replace('天', '').replace('+', ''))
-                
-                return (
-                    x['project'],
-                    -days_num,  # Negative for descending order
-                    x['priority'],
-                    x['assigned_to']
-                )
+                        }
+                        
+                        # Sort by project, adjustment days desc, priority, assigned_to
+                        keyed_rows.append(((project, -days_num, priority, assigned_to), row))
             
-            result.sort(key=sort_key)
+            # Sort on the keys only (rows themselves are not comparable)
+            keyed_rows.sort(key=itemgetter(0))
+            result = [row for _, row in keyed_rows]
             
             logger.info(f"Found {len(result)} due date changes on {date_str}")
             return result
@@ -322,40 +513,94 @@ class RedmineService:
             # Check if this journal contains due date changes
             if hasattr(journal, 'details'):
                 for detail in journal.details:
-                    # Handle both dict and object formats for detail
+                    # Handle both dict and object formats for detail:
+                    # python-redmine 2.5.0+ returns dicts, older versions objects
                     if isinstance(detail, dict):
-                        # python-redmine 2.5.0+ returns dict format
-                        field_name = detail.get('name', '')
-                        old_value = detail.get('old_value', '')
-                        new_value = detail.get('new_value', '')
-                        property_type = detail.get('property', '')
+                        detail_get = detail.get
                     else:
-                        # Legacy object format
-                        field_name = getattr(detail, 'name', '')
-                        old_value = getattr(detail, 'old_value', '')
-                        new_value = getattr(detail, 'new_value', '')
-                        property_type = getattr(detail, 'property', '')
+                        detail_get = partial(getattr, detail)
                     
-                    # Check if this is a due_date change for attribute properties
-                    if property_type == 'attr' and field_name == 'due_date':
-                        changes.append({
-                            'user': journal.user.name if hasattr(journal, 'user') else 'Unknown',
-                            'old_date': old_value or '',
-                            'new_date': new_value or '',
-                            'change_date': journal.created_on.strftime('%Y-%m-%d %H:%M')
-                        })
+                    # Only due_date attribute changes matter; the other values
+                    # are read for those alone
+                    if (detail_get('property', ''), detail_get('name', '')) != _DUE_DATE_DETAIL:
+                        continue
+                    
+                    changes.append({
+                        'user': _name(journal, 'user', 'Unknown'),
+                        'old_date': detail_get('old_value', '') or '',
+                        'new_date': detail_get('new_value', '') or '',
+                        'change_date': _format_datetime(journal.created_on)
+                    })
         
         return changes
     
     def _get_user_role(self, user) -> str:
+        """Get user role/group name, cached per user"""
+        if not user:
+            return '未分派'
+        
+        self._expire_role_cache()
+        
+        key = getattr(user, 'id', None) or str(user)
+        role = self._role_cache.get(key)
+        if role is None:
+            role = self._resolve_user_role(user)
+            self._role_cache[key] = role
+        return role
+    
+    def _expire_role_cache(self):
+        """Drop all cached roles once they are older than _ROLE_CACHE_TTL"""
+        if time.monotonic() - self._role_cache_time > _ROLE_CACHE_TTL:
+            self._role_cache.clear()
+            self._role_cache_time = time.monotonic()
+    
+    async def _prefetch_user_roles(self, issues: List):
         """
-        Get user role/group name
+        Fetch the groups of all uncached assignees concurrently
+        
+        Without this, the first issue of each assignee resolves its role
+        serially on the event loop (python-redmine loads groups lazily).
+        """
+        self._expire_role_cache()
+        
+        user_ids = set()
+        for issue in issues:
+            assigned_to = getattr(issue, 'assigned_to', None)
+            user_id = getattr(assigned_to, 'id', None)
+            if user_id is not None and user_id not in self._role_cache:
+                user_ids.add(user_id)
+        if not user_ids:
+            return
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(_USER_FETCH_CONCURRENCY)
+        
+        def fetch_role(user_id) -> str:
+            user = self.redmine.user.get(user_id, include=['groups'])
+            # Read the raw response: a missing include would make python-redmine
+            # fetch the user again (groups need an admin API key)
+            groups = user.raw().get('groups') or []
+            if groups:
+                return groups[0].get('name', '一般使用者')
+            return self._role_from_name(getattr(user, 'name', str(user)))
+        
+        async def prefetch(user_id):
+            async with semaphore:
+                try:
+                    self._role_cache[user_id] = await loop.run_in_executor(None, fetch_role, user_id)
+                except Exception as e:
+                    # e.g. issues assigned to a group; resolved per issue instead
+                    logger.debug("Could not prefetch role of user %s: %s", user_id, e)
+        
+        await asyncio.gather(*(prefetch(user_id) for user_id in user_ids))
+        logger.debug("Prefetched roles for %d users", len(user_ids))
+    
+    def _resolve_user_role(self, user) -> str:
+        """
+        Resolve a user's role/group name
         For now, use a simple mapping based on user name or can be enhanced
         to fetch actual Redmine user groups/roles via API
         """
-        if not user:
-            return '未分派'
-        
         try:
             # Try to get user groups if available
             if hasattr(user, 'groups'):
@@ -363,77 +608,96 @@ class RedmineService:
                 if user.groups:
                     return user.groups[0].name if hasattr(user.groups[0], 'name') else '一般使用者'
             
-            # Simple role mapping based on user name patterns (can be customized)
-            username = user.name if hasattr(user, 'name') else str(user)
-            
-            # You can customize these role mappings based on your organization
-            if 'manager' in username.lower() or '經理' in username or '主管' in username:
-                return '管理階層'
-            elif 'engineer' in username.lower() or '工程師' in username:
-                return '工程師'
-            elif 'admin' in username.lower() or '管理員' in username:
-                return '系統管理員'
-            else:
-                return '一般使用者'
+            # Simple role mapping based on user name patterns
+            return self._role_from_name(user.name if hasattr(user, 'name') else str(user))
                 
         except Exception:
             return '一般使用者'
     
-    def _calculate_days_adjustment(self, old_date_str: str, new_date_str: str) -> str:
-        """Calculate the number of days adjustment between old and new due dates"""
+    def _role_from_name(self, username: str) -> str:
+        """Map a user name to a role using _ROLE_KEYWORDS"""
+        username = username.lower()
+        for role, keywords in _ROLE_KEYWORDS:
+            if any(keyword in username for keyword in keywords):
+                return role
+        return '一般使用者'
+    
+    def _calculate_days_adjustment(self, old_date_str: str, new_date_str: str) -> Tuple[str, int]:
+        """
+        Calculate the number of days adjustment between old and new due dates
+        
+        Returns:
+            (display text such as "+5天", day difference); unparsable dates
+            give ("N/A", 0)
+        """
         try:
             if not old_date_str or not new_date_str:
-                return "N/A"
+                return "N/A", 0
             
-            old_date = datetime.strptime(old_date_str, '%Y-%m-%d').date()
-            new_date = datetime.strptime(new_date_str, '%Y-%m-%d').date()
+            # Journal values are ISO dates; fromisoformat parses them in C,
+            # far cheaper than strptime's locale-aware format matching
+            old_date = date.fromisoformat(old_date_str)
+            new_date = date.fromisoformat(new_date_str)
             
             diff = (new_date - old_date).days
             
             if diff > 0:
-                return f"+{diff}天"
+                return f"+{diff}天", diff
             elif diff < 0:
-                return f"{diff}天"  # Already has minus sign
+                return f"{diff}天", diff  # Already has minus sign
             else:
-                return "0天"
+                return "0天", 0
                 
         except ValueError:
-            return "N/A"
+            return "N/A", 0
+    
+    async def _cached_count(self, name: str, fetch) -> int:
+        """Return a recently fetched count, or run the blocking fetch on a worker thread"""
+        now = time.monotonic()
+        cached = self._count_cache.get(name)
+        if cached and now - cached[0] < _COUNT_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            count = await asyncio.to_thread(fetch)
+        except Exception as e:
+            logger.error(f"Error getting {name}: {e}")
+            count = None
+        if count is None:
+            # Failures are not cached: the next request retries rather than
+            # showing a 0 that looks real for the rest of the TTL
+            return 0
+        
+        self._count_cache[name] = (now, count)
+        return count
     
     async def get_total_issue_count(self) -> int:
         """Get total number of issues"""
+        return await self._cached_count('total_issue_count', self._total_issue_count)
+    
+    def _total_issue_count(self) -> Optional[int]:
+        """Get total number of issues (blocking; None if Redmine could not be queried)"""
         try:
-            # Force evaluation by converting to list first, then get total_count
+            # A one-issue page is enough: total_count comes with it
             issues = self.redmine.issue.filter(limit=1)
-            
-            # Force evaluation to get total_count
-            try:
-                # This forces the query to execute
-                list(issues)
-                total = getattr(issues, 'total_count', 0)
-                logger.info(f"Total issues count: {total}")
-                return total
-            except Exception as e:
-                logger.warning(f"total_count method failed: {e}, trying manual count")
-                # Manual count fallback
-                all_issues = self.redmine.issue.all()
-                count = len(list(all_issues))
-                logger.info(f"Manual count total issues: {count}")
-                return count
-                
+            total = _count_of(issues)
+            logger.info(f"Total issues count: {total}")
+            return total
         except Exception as e:
             logger.error(f"Error getting total issue count: {e}")
-            return 0
+            return None
     
     async def get_open_issue_count(self) -> int:
         """Get count of open issues"""
+        return await self._cached_count('open_issue_count', self._open_issue_count)
+    
+    def _open_issue_count(self) -> Optional[int]:
+        """Get count of open issues (blocking; None if Redmine could not be queried)"""
         try:
             # Try using the 'open' status first
             try:
                 issues = self.redmine.issue.filter(status_id='o', limit=1)
-                # Force evaluation
-                list(issues)
-                total = getattr(issues, 'total_count', 0)
+                total = _count_of(issues)
                 logger.info(f"Open issues count (method 1): {total}")
                 return total
             except Exception as e1:
@@ -441,47 +705,34 @@ class RedmineService:
                 
                 # Get all open statuses and try specific IDs
                 try:
-                    statuses = self.redmine.issue_status.all()
-                    open_status_ids = [str(s.id) for s in statuses if not getattr(s, 'is_closed', False)]
+                    open_status_ids = self._open_status_ids()
                     
                     if open_status_ids:
-                        issues = self.redmine.issue.filter(status_id='|'.join(open_status_ids), limit=1)
-                        list(issues)
-                        total = getattr(issues, 'total_count', 0)
+                        issues = self.redmine.issue.filter(status_id=open_status_ids, limit=1)
+                        total = _count_of(issues)
                         logger.info(f"Open issues count (method 2): {total}")
                         return total
                 except Exception as e2:
-                    logger.warning(f"Status ID method failed: {e2}, trying manual count")
-                    
-                    # Manual count fallback
-                    try:
-                        statuses = self.redmine.issue_status.all()
-                        open_status_ids = [s.id for s in statuses if not getattr(s, 'is_closed', False)]
-                        
-                        if open_status_ids:
-                            issues = self.redmine.issue.filter(status_id='|'.join(map(str, open_status_ids)))
-                            count = len(list(issues))
-                            logger.info(f"Manual count open issues: {count}")
-                            return count
-                    except Exception as e3:
-                        logger.error(f"All open count methods failed: {e3}")
+                    logger.error(f"All open count methods failed: {e2}")
                         
-            return 0
+            return None
         except Exception as e:
             logger.error(f"Error getting open issue count: {e}")
-            return 0
+            return None
     
     async def get_today_update_count(self) -> int:
         """Get count of issues updated today"""
+        return await self._cached_count('today_update_count', self._today_update_count)
+    
+    def _today_update_count(self) -> Optional[int]:
+        """Get count of issues updated today (blocking; None if Redmine could not be queried)"""
         try:
             today = datetime.now().strftime('%Y-%m-%d')
             
             # Try different date formats for updated_on filter
             try:
                 issues = self.redmine.issue.filter(updated_on=f'>={today}', limit=1)
-                # Force evaluation
-                list(issues)
-                total = getattr(issues, 'total_count', 0)
+                total = _count_of(issues)
                 logger.info(f"Today updated issues count (method 1): {total}")
                 return total
             except Exception as e1:
@@ -490,42 +741,48 @@ class RedmineService:
                 try:
                     # Try exact date match
                     issues = self.redmine.issue.filter(updated_on=today, limit=1)
-                    list(issues)
-                    total = getattr(issues, 'total_count', 0)
+                    total = _count_of(issues)
                     logger.info(f"Today updated issues count (method 2): {total}")
                     return total
                 except Exception as e2:
-                    logger.warning(f"Exact date filter failed: {e2}, trying manual count")
-                    
-                    # Manual count fallback
-                    try:
-                        issues = self.redmine.issue.filter(updated_on=f'>={today}')
-                        count = len(list(issues))
-                        logger.info(f"Manual count today updated issues: {count}")
-                        return count
-                    except Exception as e3:
-                        logger.error(f"All today update methods failed: {e3}")
+                    logger.error(f"All today update methods failed: {e2}")
                         
-            return 0
+            return None
         except Exception as e:
             logger.error(f"Error getting today update count: {e}")
-            return 0
+            return None
     
     async def get_issue_statuses(self) -> List[Dict]:
         """Get available issue statuses"""
         try:
-            statuses = self.redmine.issue_status.all()
-            return [
+            statuses = await asyncio.to_thread(self._statuses)
+            # Copies, so callers can't alter the cached entries
+            return [dict(status) for status in statuses]
+        except Exception as e:
+            logger.error(f"Error getting issue statuses: {e}")
+            return []
+    
+    def _statuses(self) -> List[Dict]:
+        """Issue statuses, refetched at most every few minutes (blocking)"""
+        now = time.monotonic()
+        if self._statuses_cache is None or now - self._statuses_cache_time >= _STATUS_CACHE_TTL:
+            statuses = [
                 {
                     'id': status.id,
                     'name': status.name,
                     'is_closed': getattr(status, 'is_closed', False)
                 }
-                for status in statuses
+                for status in self.redmine.issue_status.all()
             ]
-        except Exception as e:
-            logger.error(f"Error getting issue statuses: {e}")
-            return []
+            self._open_status_ids_str = '|'.join(str(status['id']) for status in statuses if not status['is_closed'])
+            self._statuses_cache = statuses
+            self._statuses_cache_time = now
+        return self._statuses_cache
+    
+    def _open_status_ids(self) -> str:
+        """IDs of open statuses as a Redmine '|'-separated filter value (blocking)"""
+        self._statuses()
+        return self._open_status_ids_str
     
     async def get_users(self) -> List[Dict]:
         """Get all active users in Redmine"""
@@ -716,64 +973,28 @@ class RedmineService:
         """
         try:
             # Get issues within date range that are in special projects
-            issues = self.redmine.issue.filter(
-                updated_on=f">={start_date.strftime('%Y-%m-%d')}",
-                created_on=f"<={end_date.strftime('%Y-%m-%d')}",
-                status_id='*',  # All statuses
-                include=['journals']
+            # (Redmine returns only the 專項用 family; pages are fetched
+            # concurrently, off the event loop)
+            issues = await self._fetch_issues(
+                **self._within_special_projects(
+                    updated_on=f">={start_date.strftime('%Y-%m-%d')}",
+                    created_on=f"<={end_date.strftime('%Y-%m-%d')}",
+                    status_id='*'  # All statuses
+                )
             )
             
-            # Process statistics by role, assignee and status for special projects only
-            stats = {}
+            # Include only special projects (專項用); a cheap safety net now
+            # that Redmine filters by project
+            issues = [
+                issue for issue in issues
+                if not self._should_exclude_issue(issue, for_special_project=True)
+            ]
             
-            for issue in issues:
-                # Include only special projects (專項用)
-                if self._should_exclude_issue(issue, for_special_project=True):
-                    continue
-                    
-                assignee = issue.assigned_to.name if hasattr(issue, 'assigned_to') else '未分派'
-                status = issue.status.name if hasattr(issue, 'status') else '未知狀態'
-                
-                # Get user role/group
-                role = self._get_user_role(issue.assigned_to if hasattr(issue, 'assigned_to') else None)
-                
-                key = (role, assignee)
-                if key not in stats:
-                    stats[key] = {}
-                
-                if status not in stats[key]:
-                    stats[key][status] = 0
-                
-                stats[key][status] += 1
+            # Resolve every assignee's role up front, one request per user;
+            # counting then only hits the per-user role cache
+            await self._prefetch_user_roles(issues)
             
-            # Convert to list format for frontend with status aggregation
-            result = []
-            for (role, assignee), statuses in stats.items():
-                row = {
-                    'role': role,
-                    'assignee': assignee
-                }
-                
-                # Initialize all status columns with 0
-                for status in self.status_order:
-                    row[status] = 0
-                
-                # Calculate "簽核中" aggregation
-                approval_count = 0
-                for status_name, count in statuses.items():
-                    if status_name in self.approval_statuses:
-                        approval_count += count
-                        # Don't add individual approval statuses to display, only the aggregated one
-                    elif status_name in self.status_order:
-                        row[status_name] = count
-                
-                # Set the aggregated "簽核中" count
-                row['簽核中'] = approval_count
-                
-                result.append(row)
-            
-            # Sort by role, then by assignee
-            result.sort(key=lambda x: (x['role'], x['assignee']))
+            result = self._tabulate_statistics(issues)
             
             logger.info(f"Retrieved special project statistics for {len(result)} assignees")
             return result
@@ -792,39 +1013,46 @@ class RedmineService:
         """
         try:
             # Get issues with due dates within the range for special projects
-            issues = self.redmine.issue.filter(
-                due_date=f"><{start_date.strftime('%Y-%m-%d')}|{end_date.strftime('%Y-%m-%d')}",
-                status_id='*',
-                sort='due_date:asc',
-                include=['journals']
+            # (Redmine returns only the 專項用 family; pages are fetched
+            # concurrently, off the event loop)
+            issues = await self._fetch_issues(
+                **self._within_special_projects(
+                    due_date=f"><{start_date.strftime('%Y-%m-%d')}|{end_date.strftime('%Y-%m-%d')}",
+                    status_id='*'
+                ),
+                sort='due_date:asc'
             )
             
-            result = []
+            # Rows are built as tuples (fields in _ISSUE_LIST_FIELDS order) and
+            # only turned into dicts once sorted
+            rows = []
+            append = rows.append
             for issue in issues:
-                # Include only special projects (專項用)
+                # Include only special projects (專項用); a cheap safety net now
+                # that Redmine filters by project
                 if self._should_exclude_issue(issue, for_special_project=True):
                     continue
-                    
-                result.append({
-                    'project': issue.project.name if hasattr(issue, 'project') else '',
-                    'priority': issue.priority.name if hasattr(issue, 'priority') else '',
-                    'tracker': issue.tracker.name if hasattr(issue, 'tracker') else '',
-                    'assigned_to': issue.assigned_to.name if hasattr(issue, 'assigned_to') else '未分派',
-                    'status': issue.status.name if hasattr(issue, 'status') else '',
-                    'subject': issue.subject if hasattr(issue, 'subject') else '',
-                    'due_date': issue.due_date.strftime('%Y-%m-%d') if hasattr(issue, 'due_date') and issue.due_date else '',
-                    'start_date': issue.start_date.strftime('%Y-%m-%d') if hasattr(issue, 'start_date') and issue.start_date else '',
-                    'updated_on': issue.updated_on.strftime('%Y-%m-%d %H:%M') if hasattr(issue, 'updated_on') else ''
-                })
+                
+                # Fetch each optional date once instead of hasattr + two reads
+                due_date = getattr(issue, 'due_date', None)
+                start_date = getattr(issue, 'start_date', None)
+                updated_on = getattr(issue, 'updated_on', None)
+                append((
+                    _name(issue, 'project'),
+                    _name(issue, 'priority'),
+                    _name(issue, 'tracker'),
+                    _name(issue, 'assigned_to', '未分派'),
+                    _name(issue, 'status'),
+                    getattr(issue, 'subject', ''),
+                    _format_date(due_date) if due_date else '',
+                    _format_date(start_date) if start_date else '',
+                    _format_datetime(updated_on) if updated_on is not None else ''
+                ))
             
-            # Sort by project, priority, tracker, assignee, status
-            result.sort(key=lambda x: (
-                x['project'], 
-                x['priority'], 
-                x['tracker'],
-                x['assigned_to'],
-                x['status']
-            ))
+            # Sort by project, priority, tracker, assignee, status (the first
+            # five fields; ties keep Redmine's due date order)
+            rows.sort(key=_ISSUE_LIST_SORT_KEY)
+            result = [dict(zip(_ISSUE_LIST_FIELDS, row)) for row in rows]
             
             logger.info(f"Retrieved {len(result)} special project issues")
             return result
@@ -864,19 +1092,19 @@ class RedmineService:
                 
                 # Apply project filter
                 if project_filter:
-                    project_name = getattr(issue.project, 'name', '') if hasattr(issue, 'project') else ''
+                    project_name = _name(issue, 'project')
                     if project_filter.lower() not in project_name.lower():
                         continue
                 
                 # Apply tracker filter  
                 if tracker_filter:
-                    tracker_name = getattr(issue.tracker, 'name', '') if hasattr(issue, 'tracker') else ''
+                    tracker_name = _name(issue, 'tracker')
                     if tracker_filter.lower() not in tracker_name.lower():
                         continue
                 
                 # Apply status filter
                 if status_filter:
-                    issue_status = getattr(issue.status, 'name', '') if hasattr(issue, 'status') else ''
+                    issue_status = _name(issue, 'status')
                     if issue_status not in status_filter:
                         continue
                 
@@ -918,12 +1146,12 @@ class RedmineService:
             
             return {
                 'id': issue.id,
-                'project': getattr(issue.project, 'name', '') if hasattr(issue, 'project') else '',
-                'tracker': getattr(issue.tracker, 'name', '') if hasattr(issue, 'tracker') else '',
+                'project': _name(issue, 'project'),
+                'tracker': _name(issue, 'tracker'),
                 'subject': getattr(issue, 'subject', ''),
-                'status': getattr(issue.status, 'name', '') if hasattr(issue, 'status') else '',
-                'priority': getattr(issue.priority, 'name', '') if hasattr(issue, 'priority') else '',
-                'assigned_to': getattr(issue.assigned_to, 'name', '') if hasattr(issue, 'assigned_to') else '未分派',
+                'status': _name(issue, 'status'),
+                'priority': _name(issue, 'priority'),
+                'assigned_to': _name(issue, 'assigned_to', '未分派'),
                 'start_date': str(issue.start_date) if issue.start_date else '',
                 'due_date': str(issue.due_date) if issue.due_date else '',
                 'done_ratio': getattr(issue, 'done_ratio', 0),
@@ -5,6 +5,7 @@ Report Generator Service
 Service for generating Redmine reports.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, date
 from typing import List, Optional
@@ -16,10 +17,13 @@ logger = logging.getLogger(__name__)
 class ReportGenerator:
     """Service for report generation"""
     
-    def __init__(self, settings, redmine_service: RedmineService = None, email_service: EmailService = None):
+    def __init__(self, settings, redmine_service: RedmineService = None, email_service: EmailService = None,
+                 photo_service=None):
         self.settings = settings
         self.redmine_service = redmine_service or RedmineService(settings)
         self.email_service = email_service or EmailService(settings)
+        # Created on first use; kept so its directory caches survive between reports
+        self.photo_service = photo_service
         logger.info("Initialized Report Generator service")
     
     async def generate_and_send_report1(self, recipients: Optional[List[str]] = None) -> dict:
@@ -31,9 +35,11 @@ class ReportGenerator:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=getattr(self.settings, 'REPORT_DAYS', 14))
             
-            # Generate report data
-            table1_data = await self.redmine_service.get_issue_statistics(start_date, end_date)
-            table2_data = await self.redmine_service.get_issue_list(start_date, end_date)
+            # Generate report data (both tables are fetched concurrently)
+            table1_data, table2_data = await asyncio.gather(
+                self.redmine_service.get_issue_statistics(start_date, end_date),
+                self.redmine_service.get_issue_list(start_date, end_date)
+            )
             
             # Generate HTML report
             html_content = self._generate_report1_html(table1_data, table2_data, start_date, end_date)
@@ -115,9 +121,11 @@ class ReportGenerator:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=getattr(self.settings, 'REPORT_DAYS', 14))
             
-            # Generate report data for special projects
-            table1_data = await self.redmine_service.get_special_project_statistics(start_date, end_date)
-            table2_data = await self.redmine_service.get_special_project_issue_list(start_date, end_date)
+            # Generate report data for special projects (both tables are fetched concurrently)
+            table1_data, table2_data = await asyncio.gather(
+                self.redmine_service.get_special_project_statistics(start_date, end_date),
+                self.redmine_service.get_special_project_issue_list(start_date, end_date)
+            )
             
             # Generate HTML report
             html_content = self._generate_report3_html(table1_data, table2_data, start_date, end_date)
@@ -402,8 +410,10 @@ class ReportGenerator:
             logger.info("Starting Report 5 generation")
             
             # Get construction photos data
-            from .photo_service import PhotoService
-            photo_service = PhotoService(self.settings)
+            if self.photo_service is None:
+                from .photo_service import PhotoService
+                self.photo_service = PhotoService(self.settings)
+            photo_service = self.photo_service
             
             # Calculate date range
             end_date = datetime.now().date()
@@ -19,6 +19,9 @@ class SchedulerService:
         self.report_generator = report_generator
         self.settings = settings
         self.running = False
+        
+        # Caps how many scheduled reports query Redmine at the same time
+        self._sem = asyncio.Semaphore(max(1, getattr(settings, 'MAX_CONCURRENT_REPORTS', 2)))
         logger.info("Initialized Scheduler service")
     
     async def start(self):
@@ -45,17 +48,22 @@ class SchedulerService:
         try:
             logger.info("Starting scheduled report sending")
             
+            due_reports = []
+            
             # Send Report 1 if enabled
             if getattr(self.settings, 'REPORT1_AUTO_SEND', True):  # Default enabled
-                await self._send_report1()
+                due_reports.append(self._send_report1)
             
             # Send Report 2 if enabled  
             if getattr(self.settings, 'REPORT2_AUTO_SEND', True):  # Default enabled
-                await self._send_report2()
+                due_reports.append(self._send_report2)
             
             # Send Report 3 if enabled
             if getattr(self.settings, 'REPORT3_AUTO_SEND', False):  # Weekly report
-                await self._send_report3()
+                due_reports.append(self._send_report3)
+            
+            # Reports are independent, so run them concurrently (bounded by the semaphore)
+            await asyncio.gather(*(self._run_one(send) for send in due_reports), return_exceptions=True)
                 
             logger.info("Completed scheduled report sending")
             
@@ -63,6 +71,11 @@ class SchedulerService:
             logger.error(f"Error in scheduled report sending: {e}")
             raise
     
+    async def _run_one(self, send_report):
+        """Run one scheduled report while holding a concurrency slot"""
+        async with self._sem:
+            await send_report()
+    
     async def _send_report1(self):
         """Send Report 1 - Progress Statistics"""
         try:
@@ -9,6 +9,7 @@ Uses environment variables with sensible defaults.
 import os
 import logging
 import sys
+from functools import lru_cache
 from typing import Optional
 try:
     from pydantic import BaseSettings
@@ -31,6 +32,7 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = os.getenv('SMTP_USERNAME', 'GOPEAK@mail.gogopeaks.com')
     SMTP_PASSWORD: str = os.getenv('SMTP_PASSWORD', '5w~IDW')
     EMAIL_FROM: str = os.getenv('EMAIL_FROM', 'GOPEAK@mail.gogopeaks.com')
+    SMTP_TRANSPORT: str = os.getenv('SMTP_TRANSPORT', '')  # starttls / ssl / plain; empty = probe
     EMAIL_USE_TLS: bool = os.getenv('EMAIL_USE_TLS', 'true').lower() == 'true'
     EMAIL_USE_SSL: bool = os.getenv('EMAIL_USE_SSL', 'false').lower() == 'true'
     EMAIL_TIMEOUT: int = int(os.getenv('EMAIL_TIMEOUT', '60'))
@@ -47,6 +49,8 @@ class Settings(BaseSettings):
     API_HOST: str = os.getenv('API_HOST', '0.0.0.0')
     API_PORT: int = int(os.getenv('API_PORT', '3003'))
     API_PREFIX: str = os.getenv('API_PREFIX', '/api/v1')
+    API_WORKERS: int = int(os.getenv('API_WORKERS', '2'))
+    BACKGROUND_LOCK_FILE: str = os.getenv('BACKGROUND_LOCK_FILE', '/tmp/redmine_report_background.lock')  # Worker holding it runs the scheduler
     
     # Scheduling Configuration
     SCHEDULE_CRON: str = os.getenv('SCHEDULE_CRON', '0 8 * * 1')  # Every Monday at 8:00 AM
@@ -67,14 +71,20 @@ class Settings(BaseSettings):
     
     # Photo Service Configuration
     PHOTO_BASE_PATH: str = os.getenv('PHOTO_BASE_PATH', '/volume4/photo/@@案場施工照片')
+    THUMB_CACHE_DB: str = os.getenv('THUMB_CACHE_DB', '/tmp/redmine_report_thumbs.db')
+    THUMBNAIL_FORMAT: str = os.getenv('THUMBNAIL_FORMAT', 'JPEG')  # JPEG (email-safe) or WEBP
+    THUMBNAIL_WORKERS: int = int(os.getenv('THUMBNAIL_WORKERS', '1'))  # Thumbnail processes per API worker
+    PHOTO_INDEX_INTERVAL: int = int(os.getenv('PHOTO_INDEX_INTERVAL', '600'))  # Seconds between thumbnail cache warm-up passes; 0 = off
     
     # Security Configuration
     DEBUG: bool = os.getenv('DEBUG', 'false').lower() == 'true'
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     SECRET_KEY: str = os.getenv('SECRET_KEY', 'redmine-report-secret-key-2024')
+    CORS_ORIGINS: str = os.getenv('CORS_ORIGINS', '')  # Comma-separated; empty = no CORS middleware
     
     # Performance Configuration
     MAX_WORKERS: int = int(os.getenv('MAX_WORKERS', '2'))
+    MAX_CONCURRENT_REPORTS: int = int(os.getenv('MAX_CONCURRENT_REPORTS', '2'))
     WORKER_TIMEOUT: int = int(os.getenv('WORKER_TIMEOUT', '300'))
     MEMORY_LIMIT: str = os.getenv('MEMORY_LIMIT', '256M')
     CPU_LIMIT: str = os.getenv('CPU_LIMIT', '0.8')
@@ -86,21 +96,16 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        frozen = True
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings singleton"""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 def reload_settings() -> Settings:
     """Reload settings from environment (useful for testing)"""
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
     return get_settings()
 
 # Validation functions
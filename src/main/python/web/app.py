@@ -7,16 +7,32 @@ Web interface for Redmine reporting system with two main reports:
 - Report 2: Due date change tracking report
 """
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows; background jobs then need a single worker
+    fcntl = None
+
 from fastapi import FastAPI, Request, Form, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from jinja2 import FileSystemBytecodeCache
 from datetime import datetime, date, timedelta
 from typing import Optional, List
 import logging
 
+from pydantic import BaseModel, ConfigDict
+
+from ..services.email_service import EmailService
 from ..services.redmine_service import RedmineService
 from ..services.report_generator import ReportGenerator
+from ..services.scheduler_service import SchedulerService
 from ..services.synology_service import SynologyService
 
 def get_report_title(report_type: int) -> str:
@@ -33,43 +49,128 @@ from ..services.photo_service import PhotoService
 from ..utils.config import get_settings
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=getattr(logging, get_settings().LOG_LEVEL.upper(), logging.INFO))
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="Redmine Reports Dashboard",
-    description="Web interface for Redmine reporting system",
-    version="1.0.0"
-)
-
-# Setup templates and static files
-templates = Jinja2Templates(directory="src/main/resources/templates")
-app.mount("/static", StaticFiles(directory="src/main/resources/static"), name="static")
+class ReportRequest(BaseModel):
+    """Request model for manual report generation"""
+    model_config = ConfigDict(extra='forbid')
+    
+    force: bool = False
+    email_override: Optional[str] = None
 
 # Global services
 redmine_service: Optional[RedmineService] = None
 report_generator: Optional[ReportGenerator] = None
 synology_service: Optional[SynologyService] = None
 photo_service: Optional[PhotoService] = None
+scheduler_service: Optional[SchedulerService] = None
+email_service: Optional[EmailService] = None
+
+# Open lock file of the worker that runs background jobs (None elsewhere)
+background_lock_fd: Optional[int] = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    global redmine_service, report_generator, synology_service, photo_service
+def claim_background_jobs(settings) -> bool:
+    """
+    Decide whether this uvicorn worker runs the scheduler
+    
+    Every worker runs the lifespan; the first one to take an exclusive lock
+    on BACKGROUND_LOCK_FILE wins and holds it until it exits, so exactly one
+    worker schedules reports (a restarted worker can take over the lock).
+    """
+    global background_lock_fd
+    # Without a lock, only a single worker (or a DEBUG reloader) may claim them
+    single_worker = settings.DEBUG or settings.API_WORKERS <= 1
+    if fcntl is None:
+        return single_worker
+    
+    try:
+        fd = os.open(settings.BACKGROUND_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError as e:
+        logger.warning(f"Cannot open background jobs lock {settings.BACKGROUND_LOCK_FILE}: {e}")
+        return single_worker
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    background_lock_fd = fd
+    return True
+
+def release_background_jobs():
+    """Release the background jobs lock so a restarted worker can take it"""
+    global background_lock_fd
+    if background_lock_fd is not None:
+        os.close(background_lock_fd)
+        background_lock_fd = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and release them on shutdown"""
+    global redmine_service, report_generator, synology_service, photo_service, scheduler_service, email_service
     
     settings = get_settings()
     redmine_service = RedmineService(settings)
     synology_service = SynologyService(settings)
     photo_service = PhotoService(settings)
     
-    # Import services here to avoid circular imports
-    from ..services.email_service import EmailService
     email_service = EmailService(settings)
     
-    report_generator = ReportGenerator(settings, redmine_service, email_service)
+    report_generator = ReportGenerator(settings, redmine_service, email_service, photo_service)
+    scheduler_service = SchedulerService(report_generator, settings)
+    
+    # Every uvicorn worker runs this lifespan; only the worker holding the
+    # background jobs lock starts the scheduler and the photo cache warmer
+    if claim_background_jobs(settings):
+        await scheduler_service.start()
+        photo_service.start_cache_warmer(settings.PHOTO_INDEX_INTERVAL)
+    else:
+        logger.info(f"Background jobs run in another worker (pid {os.getpid()} skipped them)")
     
     logger.info("Web application started successfully")
+    
+    try:
+        yield
+    finally:
+        # Stop the scheduler and release pooled connections
+        if scheduler_service:
+            await scheduler_service.stop()
+        if email_service:
+            await email_service.close()
+        if redmine_service:
+            await redmine_service.aclose()
+        if photo_service:
+            photo_service.close()
+        release_background_jobs()
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="Redmine Reports Dashboard",
+    description="Web interface for Redmine reporting system",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Cross-origin access is only needed when a browser app on another origin
+# calls the API; n8n and cron callers are server-side, so it is off by default
+cors_origins = [origin.strip() for origin in get_settings().CORS_ORIGINS.split(',') if origin.strip()]
+if cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type", "authorization"],
+        allow_credentials=False
+    )
+
+# Setup templates and static files
+templates = Jinja2Templates(directory="src/main/resources/templates")
+# Compile templates once: skip the per-render mtime check outside DEBUG and
+# keep compiled bytecode on disk so restarted workers skip parsing
+templates.env.auto_reload = get_settings().DEBUG
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+app.mount("/static", StaticFiles(directory="src/main/resources/static"), name="static")
 
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
@@ -168,10 +269,12 @@ async def get_report1_data(days: int = 14):
         start_date = end_date - timedelta(days=days)
         
         # Table 1: Issue count by assignee and status
-        table1_data = await redmine_service.get_issue_statistics(start_date, end_date)
-        
         # Table 2: Issue list with details
-        table2_data = await redmine_service.get_issue_list(start_date, end_date)
+        # (independent queries, fetched concurrently)
+        table1_data, table2_data = await asyncio.gather(
+            redmine_service.get_issue_statistics(start_date, end_date),
+            redmine_service.get_issue_list(start_date, end_date)
+        )
         
         return {
             "success": True,
@@ -231,10 +334,12 @@ async def get_report3_data(days: int = 14):
         start_date = end_date - timedelta(days=days)
         
         # Table 1: Issue count by assignee and status (special projects only)
-        table1_data = await redmine_service.get_special_project_statistics(start_date, end_date)
-        
         # Table 2: Issue list with details (special projects only)
-        table2_data = await redmine_service.get_special_project_issue_list(start_date, end_date)
+        # (independent queries, fetched concurrently)
+        table1_data, table2_data = await asyncio.gather(
+            redmine_service.get_special_project_statistics(start_date, end_date),
+            redmine_service.get_special_project_issue_list(start_date, end_date)
+        )
         
         return {
             "success": True,
@@ -389,10 +494,13 @@ async def get_report5_data(
                 raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
         
         # Get construction photos with filters
+        # Thumbnails are served by /api/report5/thumbnail so the page only
+        # loads (and the server only renders) the ones actually displayed
         photos_data = await photo_service.get_construction_photos(
             start_date=parsed_start_date,
             end_date=parsed_end_date,
-            project_filter=project_filter
+            project_filter=project_filter,
+            inline_thumbnails=False
         )
         
         return {
@@ -413,6 +521,20 @@ async def get_report5_data(
         logger.error(f"Report 5 API error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/report5/thumbnail/{token}")
+async def get_report5_thumbnail(token: str):
+    """Serve a construction photo thumbnail listed by /api/report5/data"""
+    if not photo_service:
+        raise HTTPException(status_code=500, detail="Photo service not initialized")
+    
+    thumbnail = await photo_service.get_thumbnail(token)
+    if thumbnail is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    
+    content, media_type = thumbnail
+    # Tokens change whenever the photo does, so the browser can keep it
+    return Response(content=content, media_type=media_type, headers={"Cache-Control": "max-age=3600"})
+
 @app.get("/api/report5/projects")
 async def get_report5_projects():
     """Get list of available construction projects for Report 5 filtering"""
@@ -523,13 +645,9 @@ async def get_users():
 async def test_email_connection():
     """Test SMTP connection without sending actual email"""
     try:
-        if not redmine_service:
+        if not email_service:
             raise HTTPException(status_code=500, detail="Services not initialized")
         
-        # Import here to avoid circular imports
-        from ..services.email_service import EmailService
-        email_service = EmailService(get_settings())
-        
         # Test connection
         connection_ok = await email_service.test_connection()
         
@@ -904,10 +1022,12 @@ async def get_dashboard_stats():
         if not redmine_service:
             return {}
         
-        # Get basic counts
-        total_issues = await redmine_service.get_total_issue_count()
-        open_issues = await redmine_service.get_open_issue_count()
-        today_updates = await redmine_service.get_today_update_count()
+        # Get basic counts (three independent queries, run concurrently)
+        total_issues, open_issues, today_updates = await asyncio.gather(
+            redmine_service.get_total_issue_count(),
+            redmine_service.get_open_issue_count(),
+            redmine_service.get_today_update_count()
+        )
         
         return {
             "total_issues": total_issues,
@@ -937,4 +1057,49 @@ async def health_check():
         "status": "healthy", 
         "version": "1.0.0",
         "timestamp": datetime.now().isoformat()
+    }
+
+@app.post("/generate-report")
+async def generate_report_endpoint(request: ReportRequest = ReportRequest()):
+    """
+    Generate and send report manually (for n8n integration)
+    
+    Args:
+        request: Report generation request parameters
+        
+    Returns:
+        Success message with report details
+    """
+    if not report_generator:
+        raise HTTPException(status_code=503, detail="Report generator not initialized")
+    
+    try:
+        logger.info(f"Manual report generation requested (force={request.force})")
+        
+        # Generate and send report
+        result = await report_generator.generate_and_send_report(
+            force=request.force,
+            email_override=request.email_override
+        )
+        
+        return {
+            "success": True,
+            "message": "Report generated and sent successfully",
+            "details": result
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to generate report: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/status")
+async def get_status():
+    """Get current service status"""
+    return {
+        "services": {
+            "report_generator": "ready" if report_generator else "not_initialized",
+            "email_service": "ready" if email_service else "not_initialized",
+            "scheduler": "running" if scheduler_service and scheduler_service.is_running() else "stopped"
+        },
+        "next_scheduled_run": scheduler_service.get_next_run_time() if scheduler_service else None
     }
\ No newline at end of file